@@ -0,0 +1,137 @@
+{% macro categories() %}
+    {#
+     Low-cardinality columns stored as ENUMs, and where their values come from:
+     a seed column (plus any extra values models add), or a fixed list.
+     Contract-enforced models declare the column's type from the same values
+     with data_type "{% raw %}{{ categorical_type('product') }}{% endraw %}",
+     resolved when the model is built (see render_contract_data_types).
+     #}
+    {{ return({
+        'product': {'seed': 'plan_catalog', 'column': 'product'},
+        'plan_name': {'seed': 'plan_catalog', 'column': 'plan_name'},
+        'billing_period': {'seed': 'plan_catalog', 'column': 'billing_period'},
+        'acquisition_channel': {'seed': 'utm_channel_mapping', 'column': 'channel', 'extra': ['other']},
+        'subscription_status': {'values': ['active', 'canceled', 'expired', 'past_due', 'trial']},
+        'subscription_event_type': {'values': ['cancel', 'churn', 'downgrade', 'new', 'reactivate', 'upgrade']},
+    }) }}
+{% endmacro %}
+
+{% macro categorical(expression, category) %}
+    {#
+     Cast a low-cardinality string column to a dictionary-encoded ENUM
+
+     Args:
+       expression: Column or SQL expression holding the category's values
+       category: Key of categories(), e.g. 'product'
+
+     Returns:
+       On DuckDB, the expression cast to ENUM(values...), raising an error for any
+       non-null value outside the category; elsewhere the expression unchanged
+
+     Example:
+       select {{ categorical('s.product', 'product') }} as product
+     #}
+    {%- set definition = categories()[category] -%}
+    {%- if definition.seed -%}
+        {#- ref() outside the execute guard so the seed is a dependency of the model -#}
+        {%- do ref(definition.seed) -%}
+    {%- endif -%}
+    {#- Unit tests replace seeds with fixture CTEs that can't be queried for values -#}
+    {%- if not execute or model.resource_type == 'unit_test' -%}
+        {{ return(expression) }}
+    {%- endif -%}
+
+    {{ return(adapter.dispatch('categorical')(expression, category, categorical_values(category))) }}
+{% endmacro %}
+
+{% macro categorical_values(category) %}
+    {#- A category's values, sorted; seed values are queried, so only call this when executing -#}
+    {%- set definition = categories()[category] -%}
+    {%- if definition.seed -%}
+        {%- set query -%}
+            select distinct {{ definition.column }}
+            from {{ ref(definition.seed) }}
+            where {{ definition.column }} is not null
+        {%- endset -%}
+        {%- set values = run_query(query).columns[0].values() | list + definition.get('extra', []) -%}
+    {%- else -%}
+        {%- set values = definition['values'] -%}
+    {%- endif -%}
+    {{ return(values | unique | sort) }}
+{% endmacro %}
+
+{% macro categorical_type(category) %}
+    {#
+     The data type categorical() casts a category to, for contract data_type
+
+     Schema files are rendered before seeds can be read, so contracts defer
+     the call with raw tags; render_contract_data_types resolves it when the
+     model is built.
+
+     Args:
+       category: Key of categories(), e.g. 'product'
+
+     Returns:
+       On DuckDB, ENUM(values...) in the order categorical() uses; elsewhere
+       the string type
+
+     Example:
+       data_type: "{% raw %}{{ categorical_type('product') }}{% endraw %}"
+     #}
+    {{ return(adapter.dispatch('categorical_type')(category)) }}
+{% endmacro %}
+
+{% macro default__categorical_type(category) %}
+    {{ return(dbt.type_string()) }}
+{% endmacro %}
+
+{% macro duckdb__categorical_type(category) %}
+    {{ return('enum(' ~ enum_literals(categorical_values(category)) ~ ')') }}
+{% endmacro %}
+
+{% macro enum_literals(values) %}
+    {%- set literals = [] -%}
+    {%- for value in values -%}
+        {%- do literals.append("'" ~ (value | replace("'", "''")) ~ "'") -%}
+    {%- endfor -%}
+    {{ return(literals | join(', ')) }}
+{% endmacro %}
+
+{% macro default__categorical(expression, category, values) %}
+    {{ return(expression) }}
+{% endmacro %}
+
+{% macro duckdb__categorical(expression, category, values) %}
+    {%- set value_list = enum_literals(values) -%}
+    {%- set cast -%}
+        case
+            when {{ expression }} is null or {{ expression }} in ({{ value_list }})
+                then cast({{ expression }} as enum({{ value_list }}))
+            else error('Unknown {{ category }} value: ' || {{ expression }})
+        end
+    {%- endset -%}
+    {{ return(cast) }}
+{% endmacro %}
+
+{% macro render_contract_data_types() %}
+    {#
+     Render data types that contracts deferred with raw tags, e.g.
+     categorical_type() calls, in place on this model's columns, so the
+     contract check and the table DDL below see the resolved type
+     #}
+    {%- for column in model['columns'].values() -%}
+        {%- if '{{' in (column.get('data_type') or '') -%}
+            {%- do column.update({'data_type': render(column['data_type']) | trim}) -%}
+        {%- endif -%}
+    {%- endfor -%}
+{% endmacro %}
+
+{% macro duckdb__get_assert_columns_equivalent(sql) %}
+    {%- do render_contract_data_types() -%}
+    {{ return(dbt.default__get_assert_columns_equivalent(sql)) }}
+{% endmacro %}
+
+{% macro duckdb__get_table_columns_and_constraints() %}
+    {%- do render_contract_data_types() -%}
+    {{ return(dbt.default__get_table_columns_and_constraints()) }}
+{% endmacro %}
@@ -0,0 +1,27 @@
+{% macro count_distinct(expression) %}
+    {#
+     Distinct count that follows the distinct_counts project var
+
+     Args:
+       expression: Column or SQL expression to count distinct values of
+
+     Returns:
+       count(distinct expression) when distinct_counts is 'exact' (default), or a
+       HyperLogLog estimate (approx_count_distinct) when it is 'approximate'
+
+     Example:
+       select {{ count_distinct('user_id') }} as active_users
+     #}
+    {%- set mode = var('distinct_counts') -%}
+    {%- if mode == 'approximate' -%}
+        {{ adapter.dispatch('approx_count_distinct')(expression) }}
+    {%- elif mode == 'exact' -%}
+        count(distinct {{ expression }})
+    {%- else -%}
+        {{ exceptions.raise_compiler_error("distinct_counts must be 'exact' or 'approximate', got '" ~ mode ~ "'") }}
+    {%- endif -%}
+{% endmacro %}
+
+{% macro default__approx_count_distinct(expression) %}
+    approx_count_distinct({{ expression }})
+{% endmacro %}
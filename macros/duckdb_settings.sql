@@ -0,0 +1,45 @@
+{% macro apply_duckdb_settings() %}
+    {#
+     Pre-hook that applies a model's duckdb_settings config for the duration of its build
+
+     Settings are SET SESSION on the connection building the model, so they
+     don't reach models running concurrently on other dbt threads. dbt closes
+     that connection when the model finishes, successfully or not, which
+     discards the overrides; no post-hook has to put them back.
+
+     Options DuckDB only has database-wide (threads, memory_limit, ...) can't
+     be overridden per model; set them for the target in profiles.yml.
+
+     Returns:
+       An empty string (the SET statements are run directly)
+
+     Example:
+       {{ config(duckdb_settings={'preserve_insertion_order': false}) }}
+     #}
+    {%- set settings = config.get('duckdb_settings') or {} -%}
+    {%- if execute and settings -%}
+        {%- do adapter.dispatch('apply_duckdb_settings')(settings) -%}
+    {%- endif -%}
+    {{- return('') -}}
+{% endmacro %}
+
+{% macro default__apply_duckdb_settings(settings) %}
+    {{ log("duckdb_settings is only supported on DuckDB; ignoring it for " ~ model.name, info=true) }}
+{% endmacro %}
+
+{% macro duckdb__apply_duckdb_settings(settings) %}
+    {%- set global_only = [
+        'threads', 'worker_threads', 'memory_limit', 'max_memory',
+        'temp_directory', 'max_temp_directory_size'
+    ] -%}
+    {%- set rejected = settings.keys() | map('lower') | select('in', global_only) | list -%}
+    {%- if rejected -%}
+        {{ exceptions.raise_compiler_error(
+            "duckdb_settings on " ~ model.name ~ " sets " ~ rejected | join(', ')
+            ~ ", which DuckDB applies to the whole database; set it in profiles.yml instead"
+        ) }}
+    {%- endif -%}
+    {%- for name, value in settings.items() %}
+        {% do run_query("set session " ~ name ~ " = '" ~ value ~ "'") %}
+    {%- endfor %}
+{% endmacro %}
@@ -0,0 +1,50 @@
+{% macro fill_daily_gaps(changes, partitions, partition_column, value_columns, start_date, end_date) %}
+    {#
+     Densify a sparse daily series at query time
+
+     Args:
+       changes: Relation or CTE with at most one row per date_day and partition
+       partitions: Relation or CTE listing every partition_column value
+       partition_column: Column the series is gap-filled per (e.g. 'product')
+       value_columns: Columns of changes to carry, zero-filled on days without a row
+       start_date: SQL date expression for the first day (inclusive)
+       end_date: SQL date expression for the last day (inclusive); may be a subquery
+
+     Returns:
+       One row per day and partition with date_day, partition_column and value_columns
+
+     Example:
+       {{ fill_daily_gaps('daily_changes', 'products', 'product', ['net_mrr_change'],
+                          "cast('2024-01-01' as date)", '(select max(date_day) from daily_changes)') }}
+     #}
+    select
+        days.date_day,
+        partitions.{{ partition_column }},
+        {%- for column in value_columns %}
+        coalesce(changes.{{ column }}, 0) as {{ column }}{{ ',' if not loop.last }}
+        {%- endfor %}
+    from ({{ daily_series(start_date, end_date) }}) as days
+    cross join {{ partitions }} as partitions
+    left join {{ changes }} as changes
+        on days.date_day = changes.date_day
+        and partitions.{{ partition_column }} = changes.{{ partition_column }}
+{% endmacro %}
+
+
+{% macro daily_series(start_date, end_date) %}
+    {{ return(adapter.dispatch('daily_series')(start_date, end_date)) }}
+{% endmacro %}
+
+{% macro default__daily_series(start_date, end_date) %}
+    select cast(date_day as date) as date_day
+    from ({{ dbt.date_spine('day', start_date, dbt.dateadd('day', 1, end_date)) }}) as spine
+{% endmacro %}
+
+{% macro duckdb__daily_series(start_date, end_date) %}
+    {#- generate_series builds only the requested days, with no numbers table to filter -#}
+    select cast(unnest(generate_series(
+        cast({{ start_date }} as timestamp),
+        cast({{ end_date }} as timestamp),
+        interval 1 day
+    )) as date) as date_day
+{% endmacro %}
@@ -0,0 +1,19 @@
+{% macro lookback_start(column, periods, datepart='day') %}
+    {#
+     Start of an incremental run's reprocessing window
+
+     Args:
+       column: Column of this model to measure the window from, e.g. loaded_at
+       periods: Number of dateparts before the column's latest persisted value
+         the window starts
+       datepart: Unit of periods (default: day)
+
+     Returns:
+       An expression for max(column) in this model minus periods; only valid
+       in incremental runs and hooks, where the model already exists
+
+     Example:
+       where loaded_at >= {{ lookback_start('loaded_at', var('revenue_lookback_days')) }}
+     #}
+    {{ return(dbt.dateadd(datepart, -periods, '(select max(' ~ column ~ ') from ' ~ this ~ ')')) }}
+{% endmacro %}
@@ -0,0 +1,37 @@
+{% macro profile_model() %}
+    {#
+     Opt-in post-hook that profiles a model's query and writes the profile to
+     target/profile_<model name>.json, next to run_results.json
+
+     Does nothing unless the profile_models var is true, and only profiles
+     table and incremental models. The compiled query is executed once more
+     into a temp table with profiling enabled, so profiled builds take longer;
+     for incremental models this profiles the incremental (not full-refresh)
+     query against the already-updated target.
+
+     Returns:
+       An empty string (the profiling statements are run directly)
+
+     Example:
+       dbt build --vars '{profile_models: true}'
+       python scripts/profile_report.py
+     #}
+    {%- if execute and var('profile_models') and config.get('materialized') in ['table', 'incremental'] -%}
+        {%- do adapter.dispatch('profile_model')(model) -%}
+    {%- endif -%}
+    {{- return('') -}}
+{% endmacro %}
+
+{% macro default__profile_model(model) %}
+    {{ log("profile_models is only supported on DuckDB; skipping " ~ model.name, info=true) }}
+{% endmacro %}
+
+{% macro duckdb__profile_model(model) %}
+    {%- set output_path = (flags.TARGET_PATH or 'target') ~ '/profile_' ~ model.name ~ '.json' -%}
+    {%- set profiled_relation = '__profile_' ~ model.name -%}
+    {% do run_query("set enable_profiling = 'json'") %}
+    {% do run_query("set profiling_output = '" ~ output_path ~ "'") %}
+    {% do run_query("create or replace temp table " ~ profiled_relation ~ " as " ~ model.compiled_code) %}
+    {% do run_query("set enable_profiling = 'no_output'") %}
+    {% do run_query("drop table if exists " ~ profiled_relation) %}
+{% endmacro %}
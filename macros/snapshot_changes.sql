@@ -0,0 +1,81 @@
+{% macro snapshot_high_water_mark(loaded_at) %}
+    {#
+     Filter for a snapshot query that keeps only source rows loaded since the last run
+
+     The high-water mark is the latest loaded_at already in the snapshot (the
+     snapshot selects the column, so each version records the load that
+     delivered it), and each run compares just the rows loaded since then
+     against the snapshot instead of the whole source. It is a load time, not
+     the source's updated_at: a late-arriving row whose updated_at predates
+     versions already captured is still picked up, and the timestamp strategy
+     compares it with its own key's current version. Rows loaded at exactly
+     the mark are kept, and the hashed_timestamp strategy skips them if
+     nothing changed. On the first run (no snapshot table, or one without
+     the loaded_at column yet) nothing is filtered.
+
+     Args:
+       loaded_at: Load timestamp column, selected by the snapshot under the same name
+
+     Example:
+       select ..., loaded_at from {{ ref('stg_app_db__users') }}
+       where {{ snapshot_high_water_mark('loaded_at') }}
+     #}
+    {%- set existing = adapter.get_relation(this.database, this.schema, this.identifier) if execute else none -%}
+    {%- set columns = [] -%}
+    {%- if existing is not none -%}
+        {%- set columns = adapter.get_columns_in_relation(existing) | map(attribute='name') | map('lower') | list -%}
+    {%- endif -%}
+    {%- if loaded_at | lower not in columns -%}
+        true
+    {%- else -%}
+        {{ loaded_at }} >= (
+            select coalesce(max({{ loaded_at }}), cast('1900-01-01' as timestamp))
+            from {{ this }}
+        )
+    {%- endif -%}
+{% endmacro %}
+
+
+{% macro snapshot_hashed_timestamp_strategy(node, snapshotted_rel, current_rel, model_config, target_exists) %}
+    {#
+     Timestamp strategy that also requires the tracked columns to have changed
+
+     A row gets a new version only when its updated_at is newer than the current
+     version and its row_hash (a hash of the tracked columns, selected by the
+     snapshot) differs, so updated_at bumps that change nothing are skipped.
+     Snapshots built before row_hash existed fall back to plain timestamp
+     comparison until their first run adds the column.
+
+     Hard deletes must stay 'ignore': with snapshot_high_water_mark filtering
+     the source, unchanged rows would otherwise look deleted.
+     #}
+    {% set strategy = snapshot_timestamp_strategy(node, snapshotted_rel, current_rel, model_config, target_exists) %}
+    {% if strategy.hard_deletes != 'ignore' %}
+        {{ exceptions.raise_compiler_error(
+            "The hashed_timestamp strategy requires hard_deletes='ignore', got '" ~ strategy.hard_deletes ~ "'"
+        ) }}
+    {% endif %}
+
+    {% set has_row_hash = false %}
+    {% if target_exists and execute %}
+        {% set target_relation = adapter.get_relation(node.database, node.schema, node.alias) %}
+        {% set target_columns = adapter.get_columns_in_relation(target_relation) | map(attribute='name') | list %}
+        {% set has_row_hash = 'row_hash' in (target_columns | map('lower') | list) %}
+    {% endif %}
+
+    {% set row_changed_expr -%}
+        ({{ strategy.row_changed }}
+        {%- if has_row_hash %}
+            and {{ snapshotted_rel }}.row_hash is distinct from {{ current_rel }}.row_hash
+        {%- endif %})
+    {%- endset %}
+
+    {% do return({
+        "unique_key": strategy.unique_key,
+        "updated_at": strategy.updated_at,
+        "row_changed": row_changed_expr,
+        "scd_id": strategy.scd_id,
+        "invalidate_hard_deletes": strategy.invalidate_hard_deletes,
+        "hard_deletes": strategy.hard_deletes
+    }) %}
+{% endmacro %}
@@ -0,0 +1,47 @@
+{% macro collect_freshness(source, loaded_at_field, filter) %}
+    {#
+     Source freshness from _manifest.json instead of scanning Parquet files
+
+     Overrides dbt's version for sources read from <data_dir>/<table>.parquet
+     or read_parquet('<data_dir>/<table>/**/*.parquet'). generate_test_data.py
+     records each table's latest loaded_at, taken from the Parquet footer
+     statistics of the files it wrote, in <data_dir>/_manifest.json, found
+     beside the tables in the source's location; reading that one small file
+     takes the same time whatever the size or number of data files. Sources
+     with no manifest file (e.g. data written by an older generator), missing
+     from it, with a freshness filter or with another loaded_at_field fall
+     back to dbt's max() over the source.
+
+     Args:
+       source: Source relation, rendered as its external location
+       loaded_at_field: Column holding the load timestamp
+       filter: Optional freshness filter from the source config
+     #}
+    {%- set location = modules.re.search("'(.*?)/(\w+)(?:\.parquet|/\*\*/\*\.parquet)'", source | string) -%}
+    {%- set manifest_loaded_at = none -%}
+    {%- if location and loaded_at_field == 'loaded_at' and not filter -%}
+        {%- set manifest_path = location.group(1) ~ '/_manifest.json' -%}
+        {#- read_text() fails on a missing file in some DuckDB releases, so check first -#}
+        {%- set found = run_query("select count(*) from glob('" ~ manifest_path ~ "')") -%}
+        {%- if found.rows[0][0] > 0 -%}
+            {%- set manifest_query -%}
+                select json_extract_string(content, '$.tables.{{ location.group(2) }}.max_loaded_at')
+                from read_text('{{ manifest_path }}')
+            {%- endset -%}
+            {%- set manifest = run_query(manifest_query) -%}
+            {%- if manifest.rows | length > 0 -%}
+                {%- set manifest_loaded_at = manifest.rows[0][0] -%}
+            {%- endif -%}
+        {%- endif -%}
+    {%- endif -%}
+    {%- if not manifest_loaded_at -%}
+        {{ return(adapter.dispatch('collect_freshness', 'dbt')(source, loaded_at_field, filter)) }}
+    {%- endif -%}
+
+    {% call statement('collect_freshness', fetch_result=True, auto_begin=False) -%}
+        select
+            cast('{{ manifest_loaded_at }}' as timestamp) as max_loaded_at,
+            {{ current_timestamp() }} as snapshotted_at
+    {%- endcall %}
+    {{ return(load_result('collect_freshness')) }}
+{% endmacro %}
@@ -0,0 +1,116 @@
+{% macro scoped_relation(relation, where=none) %}
+    {#
+     The rows of relation that data tests should check under the test_scope var
+
+     With test_scope 'changed' (default), models with a test_window config are
+     narrowed to rows whose window column is within the configured number of
+     days of its latest value, i.e. what the last incremental run wrote, and
+     sampled when test_sample_rate is below 1. With 'full', on --full-refresh
+     runs, for tests with meta test_scope: full (e.g. row count checks), or
+     when the model's last build was not incremental (a first build or full
+     refresh, so every row is new), the whole relation is tested. That is
+     read from the marker mark_incremental_build() leaves on the table.
+
+     Args:
+       relation: Relation under test
+       where: Optional extra filter, e.g. a test's where config
+
+     Returns:
+       The relation itself, or a filtered subquery aliased dbt_subquery
+
+     Example:
+       {{ config(test_window={'column': 'loaded_at', 'days': 1}) }}    -- in the model
+       select * from {{ scoped_relation(ref('fct_revenue')) }} where net_revenue < 0
+     #}
+    {%- set mode = var('test_scope') -%}
+    {%- if mode not in ['changed', 'full'] -%}
+        {{ exceptions.raise_compiler_error("test_scope must be 'changed' or 'full', got '" ~ mode ~ "'") }}
+    {%- endif -%}
+
+    {%- set tested = namespace(window=none) -%}
+    {%- set scope_override = (config.get('meta') or {}).get('test_scope') -%}
+    {%- if execute and mode == 'changed' and not flags.FULL_REFRESH and scope_override != 'full' -%}
+        {%- for node in graph.nodes.values()
+            if node.resource_type == 'model'
+            and node.database == relation.database
+            and node.schema == relation.schema
+            and node.alias == relation.identifier -%}
+            {%- set tested.window = node.config.get('test_window') -%}
+        {%- endfor -%}
+        {%- if tested.window and not adapter.dispatch('last_build_was_incremental')(relation) -%}
+            {%- set tested.window = none -%}
+        {%- endif -%}
+    {%- endif -%}
+    {%- set window = tested.window -%}
+
+    {%- set filters = [where] if where else [] -%}
+    {%- if window -%}
+        {%- set latest = '(select max(' ~ window.column ~ ') from ' ~ relation ~ ')' -%}
+        {%- do filters.append(window.column ~ ' >= ' ~ dbt.dateadd('day', -window.days, latest)) -%}
+    {%- endif -%}
+    {%- set sample_rate = var('test_sample_rate') -%}
+    {%- set sampled = window and sample_rate < 1 -%}
+
+    {%- if filters or sampled -%}
+        {%- set subquery -%}
+            (select * from {{ relation }}
+            {%- if sampled %} {{ adapter.dispatch('sample_clause')(sample_rate * 100) }}{% endif %}
+            {%- if filters %} where {{ filters | join(' and ') }}{% endif %}) dbt_subquery
+        {%- endset -%}
+        {{ return(subquery) }}
+    {%- endif -%}
+    {{ return(relation) }}
+{% endmacro %}
+
+{% macro mark_incremental_build() %}
+    {#
+     Pre-hook that marks a test_window model's table as built incrementally
+
+     Runs before the model's SQL, so is_incremental() still reflects the table
+     as it was. A first build or --full-refresh creates a new table without
+     the marker, and scoped_relation() then tests all of it.
+
+     Returns:
+       An empty string (the marker is written directly)
+     #}
+    {%- if execute and config.get('test_window') and is_incremental() -%}
+        {%- do adapter.dispatch('mark_incremental_build')(this) -%}
+    {%- endif -%}
+    {{- return('') -}}
+{% endmacro %}
+
+{% macro default__mark_incremental_build(relation) %}
+{% endmacro %}
+
+{% macro duckdb__mark_incremental_build(relation) %}
+    {% do run_query("comment on table " ~ relation ~ " is 'dbt: built incrementally'") %}
+{% endmacro %}
+
+{% macro default__last_build_was_incremental(relation) %}
+    {#- Without a marker to read, keep scoping tests to the window -#}
+    {{ return(true) }}
+{% endmacro %}
+
+{% macro duckdb__last_build_was_incremental(relation) %}
+    {%- set marker -%}
+        select comment from duckdb_tables()
+        where database_name = '{{ relation.database }}'
+            and schema_name = '{{ relation.schema }}'
+            and table_name = '{{ relation.identifier }}'
+    {%- endset -%}
+    {%- set result = run_query(marker) -%}
+    {{ return(result.rows | length > 0 and result.rows[0][0] == 'dbt: built incrementally') }}
+{% endmacro %}
+
+{% macro default__sample_clause(percent) %}
+    tablesample bernoulli ({{ percent }})
+{% endmacro %}
+
+{% macro duckdb__sample_clause(percent) %}
+    tablesample {{ percent }}% (bernoulli)
+{% endmacro %}
+
+{% macro get_where_subquery(relation) %}
+    {#- Overrides dbt's version so generic tests honour test_scope as well as their where config -#}
+    {{ return(scoped_relation(relation, config.get('where'))) }}
+{% endmacro %}
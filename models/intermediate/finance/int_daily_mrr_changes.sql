@@ -1,23 +1,10 @@
 with
 
-date_spine as (
-    {{ dbt_utils.date_spine(
-        datepart="day",
-        start_date="cast('" ~ var('start_date') ~ "' as date)",
-        end_date="current_date"
-    ) }}
-),
-
-dates as (
-    select cast(date_day as date) as date_day
-    from date_spine
-),
-
 subscription_events as (
     select * from {{ ref('int_subscription_events') }}
 ),
 
--- Aggregate MRR changes by day and event type
+-- Aggregate MRR changes by day and event type; days without events have no row
 daily_changes as (
     select
         cast(event_date as date) as date_day,
@@ -30,36 +17,6 @@ daily_changes as (
         count(*) as event_count
     from subscription_events
     group by 1, 2
-),
-
--- Cross join dates with products for gap-free series
-products as (
-    select distinct product from {{ ref('stg_app_db__subscriptions') }}
-),
-
-date_product_spine as (
-    select
-        d.date_day,
-        p.product
-    from dates d
-    cross join products p
-),
-
--- Fill gaps with zeros
-filled as (
-    select
-        dp.date_day,
-        dp.product,
-        coalesce(dc.new_mrr, 0) as new_mrr,
-        coalesce(dc.expansion_mrr, 0) as expansion_mrr,
-        coalesce(dc.contraction_mrr, 0) as contraction_mrr,
-        coalesce(dc.churned_mrr, 0) as churned_mrr,
-        coalesce(dc.net_mrr_change, 0) as net_mrr_change,
-        coalesce(dc.event_count, 0) as event_count
-    from date_product_spine dp
-    left join daily_changes dc
-        on dp.date_day = dc.date_day
-        and dp.product = dc.product
 )
 
-select * from filled
+select * from daily_changes
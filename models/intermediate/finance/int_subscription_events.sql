@@ -1,12 +1,60 @@
+{{
+    config(
+        materialized='incremental',
+        incremental_strategy='delete+insert',
+        unique_key='subscription_id',
+        test_window={'column': 'snapshot_loaded_at', 'days': 1},
+        on_schema_change='append_new_columns'
+    )
+}}
+
 with
 
-subscriptions as (
-    select * from {{ ref('stg_app_db__subscriptions') }}
+snapshot_versions as (
+    select
+        subscription_id,
+        user_id,
+        product,
+        plan_name,
+        billing_period,
+        monthly_amount,
+        created_at,
+        canceled_at,
+        ended_at,
+        dbt_valid_from,
+        max(loaded_at) over (partition by subscription_id) as snapshot_loaded_at,
+        row_number() over (
+            partition by subscription_id order by dbt_valid_from
+        ) as version_number,
+        lag(monthly_amount) over (
+            partition by subscription_id order by dbt_valid_from
+        ) as previous_monthly_amount,
+        lag(canceled_at) over (
+            partition by subscription_id order by dbt_valid_from
+        ) as previous_canceled_at,
+        lag(ended_at) over (
+            partition by subscription_id order by dbt_valid_from
+        ) as previous_ended_at
+    from {{ ref('subscription_pricing_snapshot') }}
+    {% if is_incremental() %}
+    -- Every subscription with a snapshot version loaded since the last run, over its
+    -- full history: a version whose dbt_valid_from predates ones already processed
+    -- changes the lag() of the versions after it, so all of the subscription's events
+    -- are derived again and delete+insert on subscription_id replaces the old ones
+    where subscription_id in (
+        select subscription_id
+        from {{ ref('subscription_pricing_snapshot') }}
+        where loaded_at >= (
+            select coalesce(max(snapshot_loaded_at), cast('1900-01-01' as timestamp))
+            from {{ this }}
+        )
+    )
+    {% endif %}
 ),
 
--- Generate subscription lifecycle events from subscription state
+-- Generate subscription lifecycle events from snapshot version diffs
 events as (
-    -- New subscription event
+    -- New subscription event: first version seen
     select
         subscription_id,
         user_id,
@@ -17,12 +65,38 @@ events as (
         created_at as event_date,
         monthly_amount as mrr_amount,
         0 as previous_mrr_amount,
-        monthly_amount as mrr_change
-    from subscriptions
+        monthly_amount as mrr_change,
+        dbt_valid_from as snapshot_valid_from,
+        snapshot_loaded_at
+    from snapshot_versions
+    where version_number = 1
+
+    union all
+
+    -- Plan change event: MRR differs from the previous version
+    select
+        subscription_id,
+        user_id,
+        product,
+        plan_name,
+        billing_period,
+        case
+            when monthly_amount > previous_monthly_amount then 'upgrade'
+            else 'downgrade'
+        end as event_type,
+        dbt_valid_from as event_date,
+        monthly_amount as mrr_amount,
+        previous_monthly_amount as previous_mrr_amount,
+        monthly_amount - previous_monthly_amount as mrr_change,
+        dbt_valid_from as snapshot_valid_from,
+        snapshot_loaded_at
+    from snapshot_versions
+    where version_number > 1
+        and monthly_amount != previous_monthly_amount
 
     union all
 
-    -- Cancellation event
+    -- Cancellation event: first version with canceled_at set
     select
         subscription_id,
         user_id,
@@ -33,13 +107,16 @@ events as (
         canceled_at as event_date,
         0 as mrr_amount,
         monthly_amount as previous_mrr_amount,
-        -monthly_amount as mrr_change
-    from subscriptions
+        -monthly_amount as mrr_change,
+        dbt_valid_from as snapshot_valid_from,
+        snapshot_loaded_at
+    from snapshot_versions
     where canceled_at is not null
+        and previous_canceled_at is null
 
     union all
 
-    -- Expiry/churn event
+    -- Expiry/churn event: first version with ended_at set, without a cancellation
     select
         subscription_id,
         user_id,
@@ -50,10 +127,13 @@ events as (
         ended_at as event_date,
         0 as mrr_amount,
         monthly_amount as previous_mrr_amount,
-        -monthly_amount as mrr_change
-    from subscriptions
+        -monthly_amount as mrr_change,
+        dbt_valid_from as snapshot_valid_from,
+        snapshot_loaded_at
+    from snapshot_versions
     where ended_at is not null
         and canceled_at is null
+        and previous_ended_at is null
 )
 
 select
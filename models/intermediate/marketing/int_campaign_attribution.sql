@@ -15,10 +15,10 @@ campaign_revenue as (
         a.acquisition_channel,
         a.utm_source,
         a.utm_medium,
-        count(distinct a.user_id) as users_acquired,
-        count(distinct s.subscription_id) as subscriptions_created,
+        {{ count_distinct('a.user_id') }} as users_acquired,
+        {{ count_distinct('s.subscription_id') }} as subscriptions_created,
         sum(coalesce(s.monthly_amount, 0)) as total_mrr_generated,
-        count(distinct case when s.is_active then s.subscription_id end) as active_subscriptions
+        {{ count_distinct('case when s.is_active then s.subscription_id end') }} as active_subscriptions
     from acquisition a
     left join subscriptions s
         on a.user_id = s.user_id
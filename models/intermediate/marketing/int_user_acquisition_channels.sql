@@ -17,7 +17,7 @@ attributed as (
         u.utm_medium,
         u.utm_campaign,
         u.referral_code,
-        coalesce(cm.channel, 'other') as acquisition_channel,
+        {{ categorical("coalesce(cm.channel, 'other')", 'acquisition_channel') }} as acquisition_channel,
         u.created_at as signup_date,
         u.account_tier,
         u.account_status
@@ -0,0 +1,113 @@
+-- LTV prediction features: one row per customer, exported to the training jobs
+-- by scripts/export_features.py
+-- features_updated_at is the latest load of any input to a customer's row, so
+-- exports can pick up only the customers modified since the previous refresh.
+-- It uses loaded_at throughout: updated_at is business time and can predate the
+-- load that delivered the change. Account age is measured to the date of that
+-- stamp rather than current_date, so age-based features only change when the
+-- row does and --modified-since exports never ship a stale age
+
+with
+
+customers as (
+    select * from {{ ref('dim_customers') }}
+),
+
+users as (
+    select
+        user_id,
+        loaded_at
+    from {{ ref('stg_app_db__users') }}
+),
+
+subscriptions as (
+    select
+        user_id,
+        max(loaded_at) as last_subscription_loaded_at
+    from {{ ref('stg_app_db__subscriptions') }}
+    group by 1
+),
+
+engagement as (
+    select
+        user_id,
+        count(distinct activity_date) as total_active_days,
+        sum(event_count) as total_events,
+        avg(event_count) as avg_daily_events,
+        max(activity_date) as last_active_date,
+        max(last_loaded_at) as last_engagement_loaded_at
+    from {{ ref('fct_user_engagement_daily') }}
+    group by 1
+),
+
+subscription_events as (
+    select
+        user_id,
+        count(*) as total_sub_events,
+        count(case when event_type = 'new' then 1 end) as new_count,
+        count(case when event_type = 'cancel' then 1 end) as cancel_count,
+        count(case when event_type = 'churn' then 1 end) as churn_count,
+        sum(mrr_change) as total_mrr_change
+    from {{ ref('fct_subscription_events') }}
+    group by 1
+),
+
+revenue as (
+    select
+        s.user_id,
+        sum(r.net_revenue) as total_revenue,
+        max(r.loaded_at) as last_revenue_loaded_at
+    from {{ ref('fct_revenue') }} r
+    inner join {{ ref('stg_app_db__subscriptions') }} s
+        on r.stripe_subscription_id = s.stripe_subscription_id
+    group by 1
+),
+
+stamps as (
+    -- greatest() skips nulls, e.g. for customers without engagement or revenue
+    select
+        u.user_id,
+        cast(greatest(
+            u.loaded_at,
+            s.last_subscription_loaded_at,
+            e.last_engagement_loaded_at,
+            rev.last_revenue_loaded_at
+        ) as timestamp) as features_updated_at
+    from users u
+    left join subscriptions s on u.user_id = s.user_id
+    left join engagement e on u.user_id = e.user_id
+    left join revenue rev on u.user_id = rev.user_id
+)
+
+select
+    c.user_id,
+    c.account_tier,
+    c.company_size,
+    c.industry,
+    c.signup_source,
+    c.total_subscriptions,
+    c.active_subscriptions,
+    c.current_mrr,
+    date_diff('day', cast(c.created_at as date), cast(st.features_updated_at as date)) as account_age_days,
+    coalesce(e.total_active_days, 0) as total_active_days,
+    cast(coalesce(e.total_events, 0) as bigint) as total_events,
+    coalesce(e.avg_daily_events, 0) as avg_daily_events,
+    e.last_active_date,
+    coalesce(se.total_sub_events, 0) as total_sub_events,
+    coalesce(se.new_count, 0) as subscription_starts,
+    coalesce(se.cancel_count, 0) as subscription_cancels,
+    coalesce(se.churn_count, 0) as subscription_churns,
+    coalesce(se.total_mrr_change, 0) as total_mrr_change,
+    coalesce(rev.total_revenue, 0) as total_revenue,
+    case
+        when date_diff('day', cast(c.created_at as date), cast(st.features_updated_at as date)) > 0
+        then coalesce(rev.total_revenue, 0)
+            / date_diff('day', cast(c.created_at as date), cast(st.features_updated_at as date)) * 365
+        else 0
+    end as annualized_revenue,
+    st.features_updated_at
+from customers c
+inner join stamps st on c.user_id = st.user_id
+left join engagement e on c.user_id = e.user_id
+left join subscription_events se on c.user_id = se.user_id
+left join revenue rev on c.user_id = rev.user_id
@@ -13,13 +13,13 @@ joined as (
         {{ dbt_utils.generate_surrogate_key(['s.subscription_id']) }} as subscription_key,
         s.subscription_id,
         s.user_id,
-        s.product,
-        s.plan_name,
-        s.billing_period,
+        {{ categorical('s.product', 'product') }} as product,
+        {{ categorical('s.plan_name', 'plan_name') }} as plan_name,
+        {{ categorical('s.billing_period', 'billing_period') }} as billing_period,
         s.subscription_amount,
         s.discount_amount,
         s.monthly_amount,
-        s.subscription_status,
+        {{ categorical('s.subscription_status', 'subscription_status') }} as subscription_status,
         {{ get_subscription_status(
             's.subscription_status',
             's.canceled_at',
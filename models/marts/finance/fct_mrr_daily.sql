@@ -2,36 +2,92 @@
     config(
         materialized='incremental',
         unique_key='mrr_daily_id',
+        test_window={'column': 'loaded_at', 'days': 1},
         on_schema_change='append_new_columns'
     )
 }}
 
+{#- The series runs through current_date, so the window is measured from the last persisted
+    day with events: measured from max(date_day) it would always start at today and skip
+    late events for the days before -#}
+{%- set last_event_day = '(select max(date_day) from ' ~ this ~ ' where event_count > 0)' -%}
+{%- set window_start -%}
+    cast({{ dbt.dateadd('day', -var('mrr_lookback_days'), last_event_day) }} as date)
+{%- endset %}
+
+{%- set series_start -%}
+    {% if is_incremental() %}{{ window_start }}{% else %}cast('{{ var('start_date') }}' as date){% endif %}
+{%- endset %}
+
 with
 
-daily_mrr_changes as (
+sparse_changes as (
     select * from {{ ref('int_daily_mrr_changes') }}
+    {% if is_incremental() %}
+    -- Reprocess the last mrr_lookback_days days to pick up late subscription events
+    where date_day >= {{ window_start }}
+    {% endif %}
+),
+
+products as (
+    select distinct product from {{ ref('plan_catalog') }}
+),
+
+-- Gap-free series from the start of the window through today, or the latest day with
+-- events if that is later, so dashboards get a row for today even on days without events
+daily_mrr_changes as (
+    {{ fill_daily_gaps(
+        'sparse_changes',
+        'products',
+        'product',
+        ['new_mrr', 'expansion_mrr', 'contraction_mrr', 'churned_mrr', 'net_mrr_change', 'event_count'],
+        series_start,
+        'greatest(coalesce((select max(date_day) from sparse_changes), current_date), current_date)'
+    ) }}
+),
+
+{% if is_incremental() %}
+-- Running total already persisted for the last day before the window, per product
+opening_balances as (
+    select
+        persisted.product,
+        persisted.cumulative_mrr as opening_mrr
+    from {{ this }} as persisted
+    inner join (
+        select
+            product,
+            max(date_day) as date_day
+        from {{ this }}
+        where date_day < {{ window_start }}
+        group by 1
+    ) as last_persisted
+        on persisted.product = last_persisted.product
+        and persisted.date_day = last_persisted.date_day
 ),
+{% endif %}
 
 with_cumulative as (
     select
-        {{ dbt_utils.generate_surrogate_key(['date_day', 'product']) }} as mrr_daily_id,
-        date_day,
-        product,
-        new_mrr,
-        expansion_mrr,
-        contraction_mrr,
-        churned_mrr,
-        net_mrr_change,
-        event_count,
-        sum(net_mrr_change) over (
-            partition by product
-            order by date_day
+        {{ dbt_utils.generate_surrogate_key(['changes.date_day', 'changes.product']) }} as mrr_daily_id,
+        changes.date_day,
+        changes.product,
+        changes.new_mrr,
+        changes.expansion_mrr,
+        changes.contraction_mrr,
+        changes.churned_mrr,
+        changes.net_mrr_change,
+        changes.event_count,
+        {% if is_incremental() %}coalesce(opening_balances.opening_mrr, 0) + {% endif %}
+        sum(changes.net_mrr_change) over (
+            partition by changes.product
+            order by changes.date_day
             rows between unbounded preceding and current row
         ) as cumulative_mrr,
         current_timestamp as loaded_at
-    from daily_mrr_changes
+    from daily_mrr_changes as changes
     {% if is_incremental() %}
-    where date_day > (select max(date_day) from {{ this }})
+    left join opening_balances
+        on changes.product = opening_balances.product
     {% endif %}
 )
 
@@ -1,3 +1,26 @@
+{{
+    config(
+        materialized='incremental',
+        incremental_strategy='delete+insert',
+        unique_key='revenue_id',
+        test_window={'column': 'loaded_at', 'days': var('revenue_lookback_days')},
+        on_schema_change='append_new_columns',
+        pre_hook="""
+            {% if is_incremental() %}
+            {% set window_start = lookback_start('loaded_at', var('revenue_lookback_days')) %}
+            delete from {{ this }}
+            where revenue_id in (
+                select charge_id from {{ ref('stg_stripe__charges') }}
+                where loaded_at >= {{ window_start }} and charge_status <> 'succeeded'
+                union all
+                select invoice_id from {{ ref('stg_stripe__invoices') }}
+                where loaded_at >= {{ window_start }} and invoice_status <> 'paid'
+            )
+            {% endif %}
+        """
+    )
+}}
+
 with
 
 charges as (
@@ -12,7 +35,20 @@ subscriptions as (
     select * from {{ ref('stg_app_db__subscriptions') }}
 ),
 
--- Revenue from successful charges
+{% if is_incremental() %}
+-- Revenue rows are reprocessed when their charge or invoice was (re)loaded in the
+-- lookback window, which picks up status transitions, or when their subscription
+-- changed, so product and plan_name follow plan changes
+changed_subscriptions as (
+    select stripe_subscription_id
+    from subscriptions
+    where loaded_at >= {{ lookback_start('loaded_at', var('revenue_lookback_days')) }}
+),
+{% endif %}
+
+-- Revenue from successful charges. Charges reloaded in the lookback window that
+-- no longer count as revenue (e.g. refunded) are not selected; the pre-hook
+-- deletes their earlier rows, touching only the window's charges and invoices
 charge_revenue as (
     select
         charge_id as revenue_id,
@@ -25,9 +61,16 @@ charge_revenue as (
         currency,
         charge_status as status,
         is_paid,
-        created_at as revenue_date
+        created_at as revenue_date,
+        loaded_at
     from charges
     where charge_status = 'succeeded'
+    {% if is_incremental() %}
+        and (
+            loaded_at >= {{ lookback_start('loaded_at', var('revenue_lookback_days')) }}
+            or subscription_id in (select stripe_subscription_id from changed_subscriptions)
+        )
+    {% endif %}
 ),
 
 -- Revenue from paid invoices
@@ -43,9 +86,16 @@ invoice_revenue as (
         currency,
         invoice_status as status,
         invoice_status = 'paid' as is_paid,
-        created_at as revenue_date
+        created_at as revenue_date,
+        loaded_at
     from invoices
     where invoice_status = 'paid'
+    {% if is_incremental() %}
+        and (
+            loaded_at >= {{ lookback_start('loaded_at', var('revenue_lookback_days')) }}
+            or subscription_id in (select stripe_subscription_id from changed_subscriptions)
+        )
+    {% endif %}
 ),
 
 -- Combine both revenue sources
@@ -70,7 +120,8 @@ enriched as (
         c.currency,
         c.status,
         c.is_paid,
-        c.revenue_date
+        c.revenue_date,
+        c.loaded_at
     from combined c
     left join subscriptions s
         on c.stripe_subscription_id = s.stripe_subscription_id
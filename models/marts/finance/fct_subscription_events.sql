@@ -8,10 +8,10 @@ select
     event_id,
     subscription_id,
     user_id,
-    product,
-    plan_name,
-    billing_period,
-    event_type,
+    {{ categorical('product', 'product') }} as product,
+    {{ categorical('plan_name', 'plan_name') }} as plan_name,
+    {{ categorical('billing_period', 'billing_period') }} as billing_period,
+    {{ categorical('event_type', 'subscription_event_type') }} as event_type,
     event_date,
     mrr_amount,
     previous_mrr_amount,
@@ -12,11 +12,11 @@ customer_acquisition as (
 channel_summary as (
     select
         acquisition_channel,
-        count(distinct user_id) as total_signups,
-        count(distinct case when has_converted then user_id end) as converted_users,
+        {{ count_distinct('user_id') }} as total_signups,
+        {{ count_distinct('case when has_converted then user_id end') }} as converted_users,
         round(
-            count(distinct case when has_converted then user_id end) * 100.0
-            / nullif(count(distinct user_id), 0), 2
+            {{ count_distinct('case when has_converted then user_id end') }} * 100.0
+            / nullif({{ count_distinct('user_id') }}, 0), 2
         ) as conversion_rate_pct,
         sum(first_mrr) as total_mrr_acquired,
         round(avg(case when has_converted then first_mrr end), 2) as avg_mrr_per_customer,
@@ -12,7 +12,7 @@ engagement_summary as (
         sum(session_count) as total_sessions,
         min(activity_date) as first_activity_date,
         max(activity_date) as last_activity_date
-    from {{ ref('int_user_engagement_daily') }}
+    from {{ ref('fct_user_engagement_daily') }}
     group by 1
 ),
 
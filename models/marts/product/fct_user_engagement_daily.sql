@@ -1,16 +1,73 @@
+{#- Row order is irrelevant to this aggregate; not preserving it lets DuckDB
+    stream the group-by and merge with less memory -#}
+{{
+    config(
+        materialized='incremental',
+        unique_key='engagement_id',
+        test_window={'column': 'last_loaded_at', 'days': 1},
+        duckdb_settings={'preserve_insertion_order': false},
+        on_schema_change='append_new_columns'
+    )
+}}
+
 with
 
-engagement as (
-    select * from {{ ref('int_user_engagement_daily') }}
+events as (
+    select
+        *,
+        cast(event_timestamp as date) as activity_date,
+        cast(loaded_at as timestamp) as event_loaded_at
+    from {{ ref('stg_app_db__usage_events') }}
+),
+
+{% if is_incremental() %}
+-- Only (user, product, day) groups that received newly loaded events are re-aggregated
+affected_groups as (
+    select distinct
+        user_id,
+        product,
+        activity_date
+    from events
+    where event_loaded_at > (select max(last_loaded_at) from {{ this }})
+),
+
+events_to_aggregate as (
+    select events.*
+    from events
+    inner join affected_groups
+        on events.user_id = affected_groups.user_id
+        and events.product = affected_groups.product
+        and events.activity_date = affected_groups.activity_date
+    where events.activity_date >= (select min(activity_date) from affected_groups)
+),
+{% else %}
+events_to_aggregate as (
+    select * from events
+),
+{% endif %}
+
+daily_engagement as (
+    select
+        user_id,
+        product,
+        activity_date,
+        count(*) as event_count,
+        count(distinct event_type) as distinct_event_types,
+        count(distinct session_id) as session_count,
+        sum(coalesce(duration_seconds, 0)) as total_duration_seconds,
+        max(event_loaded_at) as last_loaded_at
+    from events_to_aggregate
+    group by 1, 2, 3
 )
 
 select
     {{ dbt_utils.generate_surrogate_key(['user_id', 'product', 'activity_date']) }} as engagement_id,
     user_id,
-    product,
+    {{ categorical('product', 'product') }} as product,
     activity_date,
     event_count,
     distinct_event_types,
     session_count,
-    total_duration_seconds
-from engagement
+    total_duration_seconds,
+    last_loaded_at
+from daily_engagement
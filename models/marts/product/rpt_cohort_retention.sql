@@ -0,0 +1,115 @@
+{#- Incremental runs replace every row from window_start on: the pre-hook deletes
+    them, so cohort/month pairs whose activity is gone (users deleted, events
+    reclassified) don't linger, and the query below re-inserts what it produces -#}
+{{
+    config(
+        materialized='incremental',
+        unique_key=['signup_cohort', 'activity_month'],
+        on_schema_change='append_new_columns',
+        pre_hook="""
+            {% if is_incremental() %}
+            delete from {{ this }}
+            where activity_month >= cast(
+                {{ lookback_start('activity_month', var('cohort_lookback_months'), 'month') }} as date
+            )
+            {% endif %}
+        """
+    )
+}}
+
+{#- Resolved to a literal when the model is compiled, before the pre-hook's delete
+    moves max(activity_month); the hook computes the same date just before deleting -#}
+{%- set window_start = "cast('1900-01-01' as date)" -%}
+{%- if execute and is_incremental() -%}
+    {%- set query -%}
+        select cast({{ lookback_start('activity_month', var('cohort_lookback_months'), 'month') }} as date)
+    {%- endset -%}
+    {%- set latest_window_start = run_query(query).columns[0][0] -%}
+    {%- if latest_window_start is not none -%}
+        {%- set window_start = "cast('" ~ latest_window_start ~ "' as date)" -%}
+    {%- endif -%}
+{%- endif %}
+
+with
+
+users as (
+    select * from {{ ref('stg_app_db__users') }}
+),
+
+-- Assign users to signup cohorts (by month)
+user_cohorts as (
+    select
+        user_id,
+        cast(date_trunc('month', cast(created_at as date)) as date) as signup_cohort
+    from users
+),
+
+cohort_sizes as (
+    select
+        signup_cohort,
+        count(*) as cohort_size
+    from user_cohorts
+    group by 1
+),
+
+-- One row per user and month with any activity
+monthly_activity as (
+    select
+        user_id,
+        cast(date_trunc('month', activity_date) as date) as activity_month,
+        sum(event_count) as event_count
+    from {{ ref('fct_user_engagement_daily') }}
+    {% if is_incremental() %}
+    -- The newest persisted month onward, plus cohort_lookback_months before it for
+    -- events that arrive late; older months are taken as complete
+    where activity_date >= {{ window_start }}
+    {% endif %}
+    group by 1, 2
+),
+
+cohort_activity as (
+    select
+        uc.signup_cohort,
+        ma.activity_month,
+        date_diff('month', uc.signup_cohort, ma.activity_month) as months_since_signup,
+        {{ count_distinct('ma.user_id') }} as active_users,
+        sum(ma.event_count) as total_events
+    from monthly_activity ma
+    inner join user_cohorts uc
+        on ma.user_id = uc.user_id
+    group by 1, 2, 3
+)
+
+select
+    ca.signup_cohort,
+    ca.activity_month,
+    ca.months_since_signup,
+    cs.cohort_size,
+    ca.active_users,
+    round(ca.active_users * 100.0 / cs.cohort_size, 2) as retention_pct,
+    ca.total_events
+from cohort_activity ca
+inner join cohort_sizes cs
+    on ca.signup_cohort = cs.signup_cohort
+where ca.months_since_signup >= 0
+
+{% if is_incremental() %}
+union all
+
+-- Persisted months before the window keep their activity but follow the cohort
+-- sizes, which come from all users (late signups, deletions); only rows whose
+-- size changed are rewritten
+select
+    p.signup_cohort,
+    p.activity_month,
+    p.months_since_signup,
+    cs.cohort_size,
+    p.active_users,
+    round(p.active_users * 100.0 / cs.cohort_size, 2) as retention_pct,
+    p.total_events
+from {{ this }} p
+inner join cohort_sizes cs
+    on p.signup_cohort = cs.signup_cohort
+where p.activity_month < {{ window_start }}
+    and p.cohort_size != cs.cohort_size
+{% endif %}
@@ -17,7 +17,7 @@ adoption_stats as (
     select
         fa.product,
         fa.feature_name,
-        count(distinct fa.user_id) as adopters,
+        {{ count_distinct('fa.user_id') }} as adopters,
         sum(fa.usage_count) as total_usage,
         avg(fa.usage_count) as avg_usage_per_user
     from feature_adoption fa
@@ -1,7 +1,35 @@
+{#- Materialized, unlike the other staging views, because six models, the
+    pricing snapshot and a data test read it: the source is decoded and
+    transformed once per run, and incremental runs only pick up rows loaded
+    within subscription_lookback_days of the latest load already in the table.
+    The window is keyed on loaded_at, not updated_at, so a row delivered late
+    with an older updated_at is not skipped. Soft deletes never reach the
+    delta, so the post-hook removes them. The index is not unique because
+    DuckDB checks unique indexes before delete+insert's deletes are applied;
+    the unique test covers it. -#}
+{{
+    config(
+        materialized='incremental',
+        incremental_strategy='delete+insert',
+        unique_key='subscription_id',
+        test_window={'column': 'loaded_at', 'days': var('subscription_lookback_days')},
+        indexes=[{'columns': ['subscription_id']}],
+        post_hook="""
+            delete from {{ this }}
+            where subscription_id in (
+                select id from {{ source('app_db', 'subscriptions') }} where deleted_at is not null
+            )
+        """
+    )
+}}
+
 with
 
 source as (
     select * from {{ source('app_db', 'subscriptions') }}
+    {% if is_incremental() %}
+    where loaded_at >= {{ lookback_start('loaded_at', var('subscription_lookback_days')) }}
+    {% endif %}
 ),
 
 renamed as (
@@ -10,7 +10,7 @@ renamed as (
         user_id,
         event_type,
         product,
-        cast(event_timestamp as timestamp) as event_timestamp,
+        event_timestamp,
         session_id,
         page_url,
         feature_name,
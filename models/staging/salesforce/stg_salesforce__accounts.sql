@@ -15,8 +15,8 @@ renamed as (
         billing_city,
         billing_country,
         owner_id,
-        cast(created_date as timestamp) as created_at,
-        cast(last_modified_date as timestamp) as last_modified_at,
+        created_date as created_at,
+        last_modified_date as last_modified_at,
         is_deleted,
         loaded_at
     from source
@@ -18,8 +18,8 @@ renamed as (
         is_won,
         is_closed,
         owner_id,
-        cast(created_date as timestamp) as created_at,
-        cast(last_modified_date as timestamp) as last_modified_at,
+        created_date as created_at,
+        last_modified_date as last_modified_at,
         loaded_at
     from source
 )
@@ -9,8 +9,8 @@ renamed as (
         id as identify_id,
         cast(user_id as integer) as user_id,
         anonymous_id,
-        cast("timestamp" as timestamp) as event_timestamp,
-        cast(received_at as timestamp) as received_at,
+        "timestamp" as event_timestamp,
+        received_at,
         lower(trim(email)) as email,
         name as display_name,
         company_name,
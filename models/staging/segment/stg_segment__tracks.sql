@@ -10,8 +10,8 @@ renamed as (
         cast(user_id as integer) as user_id,
         anonymous_id,
         event as event_name,
-        cast("timestamp" as timestamp) as event_timestamp,
-        cast(received_at as timestamp) as received_at,
+        "timestamp" as event_timestamp,
+        received_at,
         context_page_url,
         context_user_agent,
         context_ip,
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Benchmark `dbt build` for the TechFlow Analytics project.
+
+For each requested scale, generates test data into benchmark-data/, builds
+the project from it into an empty DuckDB database (the `benchmark` target in
+profiles.yml), and reads per-node execution_time from
+target/run_results.json. With --advance-days it then appends N days of data
+and times an incremental build on top, so full and incremental runs can be
+compared on the same dataset. The committed data/ and its manifest are not
+touched; dbt reads benchmark-data/ through the data_dir var.
+
+Every build is appended as one JSON line to the history file. Each node is
+compared with the median of its last --baseline-runs timings at the same
+scale and phase, and nodes that got slower by more than --threshold (and
+take at least --min-seconds) are reported as regressions. A build with no
+earlier runs at its scale and phase, or with no node above --min-seconds, has
+nothing to compare against; that is printed as a warning (a GitHub Actions
+annotation in CI) rather than passing as "no regressions".
+
+Usage:
+    python scripts/benchmark.py [--scale 1 10] [--advance-days 1]
+        [--history benchmarks/history.jsonl] [--threshold 0.25]
+        [--fail-on-regression]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).parent.parent
+# Relative to PROJECT_DIR, where dbt and the generator run
+DATA_DIR = Path("benchmark-data")
+RUN_RESULTS = PROJECT_DIR / "target" / "run_results.json"
+BENCHMARK_TARGET = "benchmark"
+BENCHMARK_DATABASE = PROJECT_DIR / "benchmark.duckdb"
+DEFAULT_HISTORY = PROJECT_DIR / "benchmarks" / "history.jsonl"
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_MIN_SECONDS = 0.5
+DEFAULT_BASELINE_RUNS = 5
+
+
+@dataclass
+class Regression:
+    unique_id: str
+    baseline: float
+    current: float
+
+    @property
+    def change(self) -> float:
+        return self.current / self.baseline - 1
+
+
+def run(command: list[str]) -> None:
+    print(f"$ {' '.join(command)}", flush=True)
+    subprocess.run(command, cwd=PROJECT_DIR, check=True)
+
+
+def git_sha() -> str | None:
+    result = subprocess.run(
+        ["git", "rev-parse", "--short", "HEAD"],
+        cwd=PROJECT_DIR, capture_output=True, text=True,
+    )
+    return result.stdout.strip() or None
+
+
+def source_layout() -> str:
+    """The source_layout var matching what the generator wrote."""
+    return "directory" if (PROJECT_DIR / DATA_DIR / "users").is_dir() else "file"
+
+
+def dbt(*args: str) -> list[str]:
+    return [
+        "dbt", *args,
+        "--target", BENCHMARK_TARGET,
+        "--vars", json.dumps({"source_layout": source_layout(), "data_dir": str(DATA_DIR)}),
+    ]
+
+
+def read_run_results() -> dict:
+    """Per-node timings and the overall elapsed time of the last dbt invocation."""
+    results = json.loads(RUN_RESULTS.read_text())
+    return {
+        "elapsed_seconds": round(results["elapsed_time"], 3),
+        "dbt_version": results["metadata"]["dbt_version"],
+        "nodes": {
+            result["unique_id"]: round(result["execution_time"], 3)
+            for result in results["results"]
+            if result["status"] in ("success", "pass")
+        },
+    }
+
+
+def benchmark_scale(args: argparse.Namespace, scale: float) -> list[dict]:
+    """Generate data at one scale and time a full build, plus an incremental one if requested."""
+    generator = [
+        sys.executable, "scripts/generate_test_data.py", "--output-dir", str(DATA_DIR),
+        "--scale", str(scale), "--seed", str(args.seed),
+    ]
+    if args.workers > 1:
+        generator += ["--workers", str(args.workers)]
+    run(generator)
+
+    BENCHMARK_DATABASE.unlink(missing_ok=True)
+    run(dbt("seed"))
+
+    phases = [("full", [])]
+    if args.advance_days:
+        phases.append(("incremental", [sys.executable, "scripts/generate_test_data.py", "--output-dir", str(DATA_DIR),
+                                       "--advance-days", str(args.advance_days)]))
+
+    records = []
+    for phase, prepare in phases:
+        if prepare:
+            run(prepare)
+        run(dbt("build"))
+        records.append({
+            "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git_sha": git_sha(),
+            "scale": scale,
+            "phase": phase,
+            **read_run_results(),
+        })
+    return records
+
+
+def read_history(path: Path) -> list[dict]:
+    if not path.exists():
+        return []
+    return [json.loads(line) for line in path.read_text().splitlines() if line.strip()]
+
+
+def append_history(path: Path, records: list[dict]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a") as history:
+        for record in records:
+            history.write(json.dumps(record, sort_keys=True) + "\n")
+
+
+def warn(message: str) -> None:
+    prefix = "::warning::" if os.environ.get("GITHUB_ACTIONS") == "true" else "WARNING: "
+    print(f"{prefix}{message}", file=sys.stderr, flush=True)
+
+
+def baseline_history(record: dict, history: list[dict], baseline_runs: int) -> list[dict]:
+    """The last baseline_runs builds at the same scale and phase as record."""
+    return [
+        past for past in history
+        if past["scale"] == record["scale"] and past["phase"] == record["phase"]
+    ][-baseline_runs:]
+
+
+def warn_if_unchecked(record: dict, previous: list[dict], min_seconds: float) -> None:
+    """Warn when record has no baseline or no node slow enough to compare."""
+    build = f"scale {record['scale']:g} {record['phase']} build"
+    if not previous:
+        warn(f"No benchmark history for the {build}; regressions were not checked")
+    elif not any(seconds >= min_seconds for seconds in record["nodes"].values()):
+        warn(f"No node of the {build} took {min_seconds:g}s or more; regressions were not checked")
+
+
+def find_regressions(
+    record: dict,
+    previous: list[dict],
+    threshold: float,
+    min_seconds: float,
+) -> list[Regression]:
+    """Nodes slower than the median of their timings in previous builds."""
+    regressions = []
+    for unique_id, current in record["nodes"].items():
+        timings = [past["nodes"][unique_id] for past in previous if unique_id in past["nodes"]]
+        if not timings or current < min_seconds:
+            continue
+        baseline = statistics.median(timings)
+        if baseline > 0 and current > baseline * (1 + threshold):
+            regressions.append(Regression(unique_id, baseline, current))
+    return sorted(regressions, key=lambda r: r.current - r.baseline, reverse=True)
+
+
+def report(record: dict, regressions: list[Regression], top: int) -> None:
+    print(f"\nscale {record['scale']:g}, {record['phase']} build: {record['elapsed_seconds']:.1f}s")
+    slowest = sorted(record["nodes"].items(), key=lambda item: item[1], reverse=True)[:top]
+    for unique_id, seconds in slowest:
+        print(f"  {seconds:8.2f}s  {unique_id}")
+    if regressions:
+        print("  Regressions:")
+        for r in regressions:
+            print(f"  {r.baseline:8.2f}s -> {r.current:.2f}s ({r.change:+.0%})  {r.unique_id}")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--scale", type=float, nargs="+", default=[1.0],
+        help="Data scales to benchmark, as passed to generate_test_data.py (default: 1)",
+    )
+    parser.add_argument("--seed", type=int, default=42, help="Generator seed (default: 42)")
+    parser.add_argument("--workers", type=int, default=1, help="Generator worker processes (default: 1)")
+    parser.add_argument(
+        "--advance-days", type=int, default=0, metavar="N",
+        help="Also time an incremental build after appending N days of data (default: off)",
+    )
+    parser.add_argument(
+        "--history", type=Path, default=DEFAULT_HISTORY,
+        help=f"JSON-lines file results are appended to (default: {DEFAULT_HISTORY.relative_to(PROJECT_DIR)})",
+    )
+    parser.add_argument(
+        "--threshold", type=float, default=DEFAULT_THRESHOLD,
+        help=f"Relative slowdown that counts as a regression (default: {DEFAULT_THRESHOLD})",
+    )
+    parser.add_argument(
+        "--min-seconds", type=float, default=DEFAULT_MIN_SECONDS,
+        help=f"Ignore nodes faster than this, where noise dominates (default: {DEFAULT_MIN_SECONDS})",
+    )
+    parser.add_argument(
+        "--baseline-runs", type=int, default=DEFAULT_BASELINE_RUNS,
+        help=f"Previous runs whose median is the baseline (default: {DEFAULT_BASELINE_RUNS})",
+    )
+    parser.add_argument("--top", type=int, default=10, help="Slowest nodes to list per build (default: 10)")
+    parser.add_argument(
+        "--fail-on-regression", action="store_true",
+        help="Exit with status 1 if any node regressed",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    history = read_history(args.history)
+
+    regressed = False
+    for scale in args.scale:
+        records = benchmark_scale(args, scale)
+        for record in records:
+            previous = baseline_history(record, history, args.baseline_runs)
+            warn_if_unchecked(record, previous, args.min_seconds)
+            regressions = find_regressions(record, previous, args.threshold, args.min_seconds)
+            report(record, regressions, args.top)
+            regressed = regressed or bool(regressions)
+        append_history(args.history, records)
+        history.extend(records)
+
+    print(f"\nHistory appended to {args.history}")
+    if regressed and args.fail_on_regression:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
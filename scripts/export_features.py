@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Export the LTV feature set from the DuckDB database as Arrow or Parquet.
+
+Reads the dim_customer_ltv_features mart built by `dbt build` straight out of
+the database file (read-only), so training jobs get columnar data without
+going through a cursor, row-by-row fetches or CSV:
+
+  - arrow:   an Arrow IPC stream of record batches, to a file or stdout, e.g.
+             `python scripts/export_features.py | python train.py` with
+             `pyarrow.ipc.open_stream(sys.stdin.buffer)` on the other end.
+             Python jobs can also call read_features() for a RecordBatchReader.
+  - parquet: a Parquet dataset written by DuckDB's COPY, optionally
+             hive-partitioned by one or more columns.
+
+--columns restricts the export to some features (user_id is always included),
+and --modified-since to customers whose features_updated_at is at or after the
+given timestamp, i.e. those changed since the previous refresh.
+
+Usage:
+    python scripts/export_features.py [--database dev.duckdb] [--schema marts]
+        [--columns current_mrr total_revenue] [--modified-since 2024-06-01]
+        [--format arrow|parquet] [--output -] [--partition-by account_tier]
+        [--batch-size 65536]
+"""
+
+import argparse
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import duckdb
+import pyarrow as pa
+
+PROJECT_DIR = Path(__file__).parent.parent
+DEFAULT_DATABASE = PROJECT_DIR / "dev.duckdb"
+DEFAULT_SCHEMA = "marts"
+FEATURE_MODEL = "dim_customer_ltv_features"
+KEY_COLUMN = "user_id"
+MODIFIED_COLUMN = "features_updated_at"
+DEFAULT_BATCH_SIZE = 65536
+
+
+def quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def feature_columns(connection: duckdb.DuckDBPyConnection, schema: str) -> list[str]:
+    rows = connection.execute(
+        "select column_name from information_schema.columns"
+        " where table_schema = ? and table_name = ? order by ordinal_position",
+        [schema, FEATURE_MODEL],
+    ).fetchall()
+    if not rows:
+        raise SystemExit(f"{schema}.{FEATURE_MODEL} not found; run `dbt build --select {FEATURE_MODEL}` first")
+    return [name for (name,) in rows]
+
+
+def feature_query(
+    connection: duckdb.DuckDBPyConnection,
+    schema: str,
+    columns: list[str] | None,
+    modified_since: datetime | None,
+) -> tuple[str, list]:
+    """The select statement and its parameters for the requested columns and customers."""
+    available = feature_columns(connection, schema)
+    if columns:
+        unknown = sorted(set(columns) - set(available))
+        if unknown:
+            raise SystemExit(f"Unknown feature columns: {', '.join(unknown)}")
+        selected = [KEY_COLUMN] + [column for column in columns if column != KEY_COLUMN]
+    else:
+        selected = available
+
+    query = f"select {', '.join(quote(column) for column in selected)} from {quote(schema)}.{quote(FEATURE_MODEL)}"
+    parameters = []
+    if modified_since:
+        query += f" where {quote(MODIFIED_COLUMN)} >= ?"
+        parameters.append(modified_since)
+    return query, parameters
+
+
+def read_features(
+    database: Path = DEFAULT_DATABASE,
+    schema: str = DEFAULT_SCHEMA,
+    columns: list[str] | None = None,
+    modified_since: datetime | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> pa.RecordBatchReader:
+    """Stream features as Arrow record batches; DuckDB hands over its vectors without row conversion."""
+    connection = duckdb.connect(str(database), read_only=True)
+    query, parameters = feature_query(connection, schema, columns, modified_since)
+    result = connection.execute(query, parameters)
+    # to_arrow_reader replaces fetch_record_batch in newer DuckDB releases
+    to_reader = getattr(result, "to_arrow_reader", None) or result.fetch_record_batch
+    return to_reader(batch_size)
+
+
+def export_arrow(args: argparse.Namespace) -> int:
+    reader = read_features(args.database, args.schema, args.columns, args.modified_since, args.batch_size)
+    to_stdout = str(args.output) == "-"
+    sink = sys.stdout.buffer if to_stdout else pa.OSFile(str(args.output), "wb")
+    rows = 0
+    try:
+        with pa.ipc.new_stream(sink, reader.schema) as writer:
+            for batch in reader:
+                writer.write_batch(batch)
+                rows += batch.num_rows
+    finally:
+        if not to_stdout:
+            sink.close()
+    return rows
+
+
+def export_parquet(args: argparse.Namespace) -> int:
+    if str(args.output) == "-":
+        raise SystemExit("--format parquet needs an --output file or directory")
+    connection = duckdb.connect(str(args.database), read_only=True)
+    query, parameters = feature_query(connection, args.schema, args.columns, args.modified_since)
+    options = ["format parquet", "compression zstd"]
+    if args.partition_by:
+        options.append(f"partition_by ({', '.join(quote(column) for column in args.partition_by)})")
+        options.append("overwrite_or_ignore")
+    # COPY writes the files in parallel straight from DuckDB and returns the row count
+    output = str(args.output).replace("'", "''")
+    return connection.execute(f"copy ({query}) to '{output}' ({', '.join(options)})", parameters).fetchone()[0]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--database", type=Path, default=DEFAULT_DATABASE,
+        help=f"DuckDB database built by dbt (default: {DEFAULT_DATABASE.relative_to(PROJECT_DIR)})",
+    )
+    parser.add_argument(
+        "--schema", default=DEFAULT_SCHEMA,
+        help=f"Schema of {FEATURE_MODEL}, e.g. main_marts for the prod target (default: {DEFAULT_SCHEMA})",
+    )
+    parser.add_argument("--columns", nargs="+", metavar="COLUMN", help="Feature columns to export (default: all)")
+    parser.add_argument(
+        "--modified-since", type=datetime.fromisoformat, metavar="TIMESTAMP",
+        help=f"Only customers whose {MODIFIED_COLUMN} is at or after this ISO timestamp",
+    )
+    parser.add_argument(
+        "--format", choices=["arrow", "parquet"], default="arrow", help="Output format (default: arrow)",
+    )
+    parser.add_argument(
+        "--output", type=Path, default=Path("-"),
+        help="Output file, or directory with --partition-by; '-' streams Arrow to stdout (default: -)",
+    )
+    parser.add_argument(
+        "--partition-by", nargs="+", metavar="COLUMN",
+        help="Hive-partition the Parquet output by these columns",
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+        help=f"Rows per Arrow record batch (default: {DEFAULT_BATCH_SIZE})",
+    )
+    args = parser.parse_args()
+    if args.partition_by and args.format != "parquet":
+        parser.error("--partition-by requires --format parquet")
+    if args.partition_by and args.columns:
+        args.columns += [column for column in args.partition_by if column not in args.columns]
+    return args
+
+
+def main() -> None:
+    args = parse_args()
+    rows = export_arrow(args) if args.format == "arrow" else export_parquet(args)
+    print(f"Exported {rows} customers to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
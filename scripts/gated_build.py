@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Build only what new source data or project changes affect, and nothing when
+neither has changed.
+
+Compares data/_manifest.json, the per-table file counts, row counts and
+latest loaded_at that generate_test_data.py writes after every run, and a
+hash of the project files (models, macros, seeds, snapshots, dbt_project.yml
+and the package lock), with the copies saved by the last successful gated
+build. If no table and no project file changed, the build is skipped without
+starting dbt. Otherwise:
+
+  1. `dbt source freshness` (read from the manifest by the collect_freshness
+     override, so it doesn't scan the data) fails the gate on any source past
+     its error_after threshold, unless nothing has reloaded that source since
+     the last gated build: no model would read new data from it, so it is
+     reported and the build goes ahead (--advance-days never reloads the
+     salesforce tables, which would otherwise block every build once they
+     age past error_after). Without a previous state, or when the check
+     itself errors, any failing source fails the gate.
+  2. `dbt build --select "source_status:fresher+ state:modified+" --state
+     .freshness-state` builds the models downstream of sources whose
+     max_loaded_at advanced since the last gated build, and the models
+     changed since then with their children; incremental models fed only by
+     unchanged sources are not run at all. Without a previous state
+     everything is built.
+  3. On success, target/sources.json, target/manifest.json, the manifest's
+     tables, the project hash and the source_layout are saved to
+     .freshness-state/ for the next run.
+
+A change of source_layout (e.g. the first --advance-days moving files into
+directories) moves every source, so it triggers a full build.
+
+Arguments after `--` are passed to dbt build.
+
+Usage:
+    python scripts/gated_build.py [--target dev] [--force] [-- --fail-fast]
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).parent.parent
+DATA_DIR = PROJECT_DIR / "data"
+MANIFEST_FILE = DATA_DIR / "_manifest.json"
+SOURCES_JSON = PROJECT_DIR / "target" / "sources.json"
+MANIFEST_JSON = PROJECT_DIR / "target" / "manifest.json"
+STATE_DIR = PROJECT_DIR / ".freshness-state"
+# Everything in the project that changes what a build produces
+PROJECT_PATHS = ["dbt_project.yml", "macros", "models", "seeds", "snapshots", "packages.yml", "package-lock.yml"]
+# The table name in a source's rendered external location, as in macros/source_freshness.sql
+SOURCE_TABLE = re.compile(r"/(\w+)(?:\.parquet|/\*\*/\*\.parquet)'")
+
+
+def run(command: list[str]) -> None:
+    print(f"$ {' '.join(command)}", flush=True)
+    subprocess.run(command, cwd=PROJECT_DIR, check=True)
+
+
+def source_layout() -> str:
+    """The source_layout var matching what the generator wrote."""
+    return "directory" if (DATA_DIR / "users").is_dir() else "file"
+
+
+def dbt(target: str | None, *args: str) -> list[str]:
+    command = ["dbt", *args, "--vars", json.dumps({"source_layout": source_layout()})]
+    if target:
+        command += ["--target", target]
+    return command
+
+
+def read_json(path: Path) -> dict | None:
+    return json.loads(path.read_text()) if path.exists() else None
+
+
+def advanced_tables(current: dict, previous: dict) -> list[str]:
+    """Tables whose files, rows or latest loaded_at differ from the last gated build."""
+    return sorted(name for name in current.keys() | previous.keys() if current.get(name) != previous.get(name))
+
+
+def source_tables(dbt_manifest: dict) -> dict[str, str]:
+    """Map each source's unique_id to the table name generate_test_data.py writes it as."""
+    tables = {}
+    for unique_id, source in dbt_manifest["sources"].items():
+        match = SOURCE_TABLE.search(source["relation_name"] or "")
+        if match:
+            tables[unique_id] = match.group(1)
+    return tables
+
+
+def failed_freshness(freshness: dict, tables: dict[str, str], advanced: list[str]) -> tuple[list[str], list[str]]:
+    """
+    Split the sources that failed `dbt source freshness` into those that block the build
+    and those past error_after that nothing has reloaded since the last gated build.
+    """
+    blocking, unchanged = [], []
+    for result in freshness["results"]:
+        if result["status"] in ("pass", "warn"):
+            continue
+        table = tables.get(result["unique_id"])
+        if result["status"] == "error" and table is not None and table not in advanced:
+            unchanged.append(result["unique_id"])
+        else:
+            blocking.append(result["unique_id"])
+    return sorted(blocking), sorted(unchanged)
+
+
+def project_hash() -> str:
+    """Hash of the names and contents of the project files in PROJECT_PATHS."""
+    digest = hashlib.sha256()
+    for name in PROJECT_PATHS:
+        root = PROJECT_DIR / name
+        paths = [root] if root.is_file() else sorted(p for p in root.rglob("*") if p.is_file())
+        for path in paths:
+            digest.update(str(path.relative_to(PROJECT_DIR)).encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", help="dbt target (default: the profile's default)")
+    parser.add_argument("--force", action="store_true", help="Build everything, ignoring the saved state")
+    parser.add_argument("dbt_args", nargs=argparse.REMAINDER, help="Extra arguments for dbt build, after --")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    manifest = read_json(MANIFEST_FILE)
+    current = manifest["tables"] if manifest else None
+    project = project_hash()
+    state = read_json(STATE_DIR / "state.json")
+    has_state = (
+        state is not None
+        and state["source_layout"] == source_layout()
+        and (STATE_DIR / "sources.json").exists()
+        and (STATE_DIR / "manifest.json").exists()
+        and not args.force
+    )
+
+    advanced = None
+    if has_state and current is not None and state["tables"] is not None:
+        advanced = advanced_tables(current, state["tables"])
+        project_changed = state.get("project") != project
+        if not advanced and not project_changed:
+            print("No source table or project file has changed since the last gated build; nothing to build")
+            return
+        if advanced:
+            print(f"Advanced since the last gated build: {', '.join(advanced)}")
+        if project_changed:
+            print("Project files changed since the last gated build")
+
+    # A sources.json left by an earlier run must not stand in for a check that crashed
+    SOURCES_JSON.unlink(missing_ok=True)
+    try:
+        run(dbt(args.target, "source", "freshness"))
+    except subprocess.CalledProcessError:
+        freshness = read_json(SOURCES_JSON) if advanced is not None else None
+        if freshness is None:
+            sys.exit("Source freshness check failed; not building")
+        blocking, unchanged = failed_freshness(freshness, source_tables(read_json(MANIFEST_JSON)), advanced)
+        if blocking or not unchanged:
+            sys.exit(f"Source freshness check failed for {', '.join(blocking) or 'the project'}; not building")
+        print(f"Past error_after but not reloaded since the last gated build: {', '.join(unchanged)}")
+
+    extra = [arg for arg in args.dbt_args if arg != "--"]
+    if has_state:
+        selector = "source_status:fresher+ state:modified+"
+        run(dbt(args.target, "build", "--select", selector, "--state", str(STATE_DIR), *extra))
+    else:
+        run(dbt(args.target, "build", *extra))
+
+    STATE_DIR.mkdir(exist_ok=True)
+    shutil.copy2(SOURCES_JSON, STATE_DIR / "sources.json")
+    shutil.copy2(MANIFEST_JSON, STATE_DIR / "manifest.json")
+    (STATE_DIR / "state.json").write_text(
+        json.dumps({"source_layout": source_layout(), "project": project, "tables": current}, indent=2) + "\n"
+    )
+
+
+if __name__ == "__main__":
+    main()
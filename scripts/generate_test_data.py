@@ -8,32 +8,123 @@ Creates synthetic data for multiple source systems:
 - segment: tracks, identifies
 - salesforce: accounts, opportunities
 
-Outputs Parquet files to data/ for DuckDB to read directly.
+Outputs Parquet files to data/ for DuckDB to read directly, or to the
+directory given by --output-dir; dbt reads another directory with
+--vars '{data_dir: <dir>}'.
+
+Tables are generated column-at-a-time with NumPy and PyArrow, so the
+--scale flag can produce 100x-1000x the default 500 users in minutes.
+Faker is only used to build small vocabularies (names, cities, user
+agents) that are then sampled with vectorized draws.
+
+Users are generated in chunks and every table is streamed into a
+ParquetWriter batch by batch, so memory stays bounded by --chunk-size
+rather than by the full dataset. Row-group size and compression codec are
+configurable, and --partition-events writes usage_events and
+segment_tracks as hive-partitioned directories keyed by event_date.
+Timestamps are written as typed Parquet TIMESTAMP columns (Stripe keeps
+its epoch integers), so row-group min/max statistics let DuckDB skip data
+on date filters.
+
+Each chunk is a shard with its own seed and id ranges, so --workers N
+generates shards in parallel processes (one Parquet file per shard and
+table) and the rows are identical for any worker count. Salesforce
+accounts dedupe companies across all users and are generated once the
+shards are done.
+
+Any run that writes directories (--workers > 1 or --partition-events)
+is read by dbt with --vars '{source_layout: directory}'.
+
+A full run records its seed, population and end date in
+data/_generator_state.json. --advance-days N then simulates the next N
+days of loads on top of that data: new signups, subscription and account
+state changes with a bumped updated_at, and the charges, invoices and
+events that fall in the new window. State tables (users, subscriptions)
+are rewritten; fact tables get an extra load-NNNN file or partition, and
+the output switches to the directory layout.
+
+Every run ends by writing data/_manifest.json: for each table, its file
+and row counts and the largest loaded_at, read from the Parquet footer
+statistics of the files just written. Source freshness checks read that
+instead of scanning the data.
+
+Every row is stamped with the run's loaded_at, the current time unless
+--loaded-at pins it; with a pinned value the output is byte-for-byte the
+same for the same arguments, so CI can cache builds keyed on the data.
+
+Usage:
+    python scripts/generate_test_data.py [--scale 100] [--seed 42]
+        [--chunk-size 10000] [--row-group-size 122880]
+        [--compression zstd] [--partition-events] [--workers 8]
+        [--loaded-at 2026-01-01T00:00:00] [--output-dir data]
+    python scripts/generate_test_data.py --advance-days 1 [--output-dir data]
 """
 
-import random
-import uuid
-from datetime import datetime, timedelta
+import argparse
+import json
+import multiprocessing
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
 from pathlib import Path
 
+import numpy as np
 import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
 import pyarrow.parquet as pq
 from faker import Faker
 
-fake = Faker()
-Faker.seed(42)
-random.seed(42)
-
 # Configuration
-NUM_USERS = 500
+BASE_NUM_USERS = 500
 START_DATE = datetime(2024, 1, 1)
 END_DATE = datetime(2025, 12, 31)
 DATA_DIR = Path(__file__).parent.parent / "data"
+DEFAULT_SEED = 42
+VOCAB_SIZE = 1000
+DEFAULT_CHUNK_SIZE = 10_000
+# Matches DuckDB's own row group size, so each Parquet row group maps to one scan unit
+DEFAULT_ROW_GROUP_SIZE = 122_880
+COMPRESSION_CODECS = ["snappy", "zstd", "gzip", "lz4", "none"]
+
+SOURCE_TABLES = {
+    "app_db": ["users", "subscriptions", "usage_events"],
+    "stripe": ["stripe_customers", "stripe_charges", "stripe_invoices"],
+    "segment": ["segment_tracks", "segment_identifies"],
+    "salesforce": ["salesforce_accounts", "salesforce_opportunities"],
+}
+# Event tables that --partition-events splits by date, and the timestamp they are keyed on
+PARTITIONED_TABLES = {
+    "usage_events": "event_timestamp",
+    "segment_tracks": "timestamp",
+}
+PARTITION_COLUMN = "event_date"
+# Upper bound on rows per user, used to give every shard a disjoint id range
+MAX_ROWS_PER_USER = {
+    "users": 1,
+    "subscriptions": 3,
+    "usage_events": 200,
+}
+# User columns the salesforce generators need, collected from every shard
+SALESFORCE_USER_COLUMNS = ["company_name", "industry", "country_code", "created_at"]
+# Seed stream for the salesforce pass, distinct from any shard index
+SALESFORCE_STREAM = 2**32 - 1
+# Seed stream for --advance-days loads, combined with the load number
+ADVANCE_STREAM = 2**32 - 2
+STATE_FILE = "_generator_state.json"
+# Tables that hold current state and are rewritten by --advance-days rather than appended to
+STATE_TABLES = ["users", "subscriptions"]
+# Per-table load summary read by source freshness checks (macros/source_freshness.sql)
+MANIFEST_FILE = "_manifest.json"
+LOADED_AT_COLUMN = "loaded_at"
 
 PRODUCTS = ["cloudsync", "teamchat", "datahub"]
 PLANS = ["starter", "professional", "enterprise"]
 BILLING_PERIODS = ["monthly", "annual"]
 SUBSCRIPTION_STATUSES = ["trial", "active", "past_due", "canceled", "expired"]
+ACCOUNT_TIERS = ["free", "starter", "professional", "enterprise"]
+ACCOUNT_STATUSES = ["active", "inactive", "suspended", "churned"]
 COMPANY_SIZES = ["1-10", "11-50", "51-200", "201-500", "500+"]
 INDUSTRIES = [
     "Technology", "Finance", "Healthcare", "Retail",
@@ -64,12 +155,28 @@ PRICING = {
     ("datahub", "enterprise", "annual"): 199990,
 }
 
+# PRICING as a (product, plan, billing_period) lookup grid for array indexing
+PRICE_GRID = np.array([
+    [[PRICING[(product, plan, period)] for period in BILLING_PERIODS] for plan in PLANS]
+    for product in PRODUCTS
+], dtype=np.int64)
+
 EVENT_TYPES = [
     "page_view", "feature_used", "file_uploaded", "file_downloaded",
     "message_sent", "dashboard_viewed", "report_generated", "api_call",
     "search_performed", "settings_changed", "integration_connected",
     "export_created",
 ]
+FEATURE_NAMES = [
+    "file_sync", "version_history", "channels", "dashboards",
+    "sql_editor", "api_access",
+]
+TRACK_EVENTS = [
+    "Signed Up", "Logged In", "Plan Upgraded", "Plan Downgraded",
+    "Feature Activated", "File Uploaded", "Dashboard Created",
+    "Report Exported", "Invite Sent", "Settings Updated",
+    "Integration Connected", "Subscription Canceled",
+]
 
 CHARGE_STATUSES = ["succeeded", "failed", "refunded", "pending"]
 INVOICE_STATUSES = ["paid", "open", "void", "uncollectible"]
@@ -77,543 +184,1147 @@ OPPORTUNITY_STAGES = [
     "Prospecting", "Qualification", "Needs Analysis",
     "Proposal", "Negotiation", "Closed Won", "Closed Lost",
 ]
+STAGE_PROBABILITY = {
+    "Prospecting": 10,
+    "Qualification": 20,
+    "Needs Analysis": 40,
+    "Proposal": 60,
+    "Negotiation": 80,
+    "Closed Won": 100,
+    "Closed Lost": 0,
+}
 
+DAY = 86_400
+START_TS = int(START_DATE.timestamp())
+END_TS = int(END_DATE.timestamp())
 
-def random_date(start: datetime, end: datetime) -> datetime:
-    delta = end - start
-    seconds = random.randint(0, max(int(delta.total_seconds()), 1))
-    return start + timedelta(seconds=seconds)
-
-
-def random_date_weighted_recent(start: datetime, end: datetime) -> datetime:
-    """Weight toward more recent dates (exponential distribution)."""
-    delta = (end - start).total_seconds()
-    # Use beta distribution skewed toward 1.0 (recent)
-    fraction = random.betavariate(2, 5)
-    return start + timedelta(seconds=delta * (1 - fraction))
-
+_HEX_BYTES = np.array([f"{i:02x}" for i in range(256)], dtype="S2")
 
-def iso(dt: datetime | None) -> str | None:
-    return dt.isoformat() if dt else None
 
+# ---------------------------------------------------------------------------
+# Vectorized helpers
+# ---------------------------------------------------------------------------
 
-def write_parquet(name: str, data: list[dict]) -> None:
-    if not data:
-        print(f"  SKIP {name} (no data)")
-        return
-    table = pa.Table.from_pylist(data)
-    path = DATA_DIR / f"{name}.parquet"
-    pq.write_table(table, path)
-    print(f"  {name}.parquet — {len(data)} rows")
+@dataclass
+class Vocabulary:
+    """Faker-generated value pools that the generators sample from."""
+
+    first_names: pa.Array
+    last_names: pa.Array
+    email_domains: pa.Array
+    company_suffixes: pa.Array
+    country_codes: pa.Array
+    timezones: pa.Array
+    uri_paths: pa.Array
+    user_agents: pa.Array
+    cities: pa.Array
+
+
+@dataclass
+class Shard:
+    index: int
+    first_user: int
+    num_users: int
+
+
+@dataclass
+class GenerationContext:
+    rng: np.random.Generator
+    vocab: Vocabulary
+    loaded_at: datetime
+    next_ids: dict[str, int] = field(default_factory=dict)
+    # Window that generated activity falls in; --advance-days moves it past the previous end
+    start_ts: int = START_TS
+    end_ts: int = END_TS
+
+    @classmethod
+    def for_shard(cls, seed: int, vocab: Vocabulary, loaded_at: datetime, shard: Shard) -> "GenerationContext":
+        """Seed from (seed, shard index) and start ids at the shard's own range."""
+        return cls(
+            rng=np.random.default_rng([seed, shard.index]),
+            vocab=vocab,
+            loaded_at=loaded_at,
+            next_ids={
+                table: shard.first_user * per_user + 1
+                for table, per_user in MAX_ROWS_PER_USER.items()
+            },
+        )
+
+    def allocate_ids(self, table: str, n: int) -> np.ndarray:
+        """Consecutive integer ids for table, continuing from the last allocation."""
+        first = self.next_ids.get(table, 1)
+        self.next_ids[table] = first + n
+        return np.arange(first, first + n)
+
+    def scale_to_window(self, counts: np.ndarray, created_at: np.ndarray) -> np.ndarray:
+        """
+        Thin per-user lifetime counts to the share of each lifetime inside the window.
+
+        A full run's window covers every lifetime, so counts come back unchanged.
+        """
+        lifetime = np.maximum(self.end_ts - created_at, 1)
+        overlap = np.clip(self.end_ts - np.maximum(created_at, self.start_ts), 0, lifetime)
+        if np.all(overlap == lifetime):
+            return counts
+        return self.rng.binomial(counts, overlap / lifetime)
+
+
+@dataclass
+class ParquetOptions:
+    row_group_size: int = DEFAULT_ROW_GROUP_SIZE
+    compression: str = "snappy"
+    partition_events: bool = False
+    # Write data/{name}/part-*.parquet instead of data/{name}.parquet
+    directory_layout: bool = False
+    # Directory the tables are written to, data/ unless --output-dir is given
+    data_dir: Path = DATA_DIR
+
+
+@dataclass
+class ShardTask:
+    shard: Shard
+    seed: int
+    vocab: Vocabulary
+    loaded_at: datetime
+    options: ParquetOptions
+
+
+def build_vocabulary(seed: int, size: int = VOCAB_SIZE) -> Vocabulary:
+    fake = Faker()
+    Faker.seed(seed)
+
+    def pool(factory) -> pa.Array:
+        return pa.array([factory() for _ in range(size)], pa.string())
+
+    return Vocabulary(
+        first_names=pool(fake.first_name),
+        last_names=pool(fake.last_name),
+        email_domains=pool(fake.free_email_domain),
+        company_suffixes=pa.array(sorted({fake.company_suffix() for _ in range(size)})),
+        country_codes=pool(fake.country_code),
+        timezones=pool(fake.timezone),
+        uri_paths=pool(fake.uri_path),
+        user_agents=pool(fake.user_agent),
+        cities=pool(fake.city),
+    )
+
+
+def choice(rng: np.random.Generator, values, n: int, p=None) -> pa.Array:
+    values = values if isinstance(values, pa.Array) else pa.array(values)
+    return values.take(rng.choice(len(values), size=n, p=p))
+
+
+def random_between(rng: np.random.Generator, low: np.ndarray, high: np.ndarray) -> np.ndarray:
+    """Uniform epoch seconds in [low, high], at least one second wide."""
+    span = np.maximum(high - low, 1)
+    return low + rng.integers(0, span, endpoint=True)
+
+
+def random_weighted_recent(rng: np.random.Generator, low: int, high: int, n: int) -> np.ndarray:
+    """Weight toward more recent dates (beta distribution skewed toward 1.0)."""
+    fraction = rng.beta(2, 5, size=n)
+    return low + ((high - low) * (1 - fraction)).astype(np.int64)
+
+
+def timestamps(seconds: np.ndarray, valid: np.ndarray | None = None) -> pa.Array:
+    mask = None if valid is None else ~valid
+    return pa.array(seconds.astype("datetime64[s]"), mask=mask)
+
+
+def epoch_seconds(column: pa.ChunkedArray | pa.Array) -> np.ndarray:
+    """Epoch seconds of a timestamp column in any unit, as generated or read back from Parquet."""
+    return column.cast(pa.timestamp("s")).cast(pa.int64()).to_numpy()
+
+
+def hex_ids(rng: np.random.Generator, n: int, length: int, prefix: str = "") -> pa.Array:
+    num_bytes = (length + 1) // 2
+    raw = rng.integers(0, 256, size=(n, num_bytes), dtype=np.uint8)
+    digits = pa.array(_HEX_BYTES[raw].view(f"S{num_bytes * 2}").ravel()).cast(pa.string())
+    if length % 2:
+        digits = pc.utf8_slice_codeunits(digits, 0, length)
+    return pc.binary_join_element_wise(prefix, digits, "")
+
+
+def uuid4_strings(rng: np.random.Generator, n: int) -> pa.Array:
+    raw = rng.integers(0, 256, size=(n, 16), dtype=np.uint8)
+    raw[:, 6] = (raw[:, 6] & 0x0F) | 0x40
+    raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80
+    digits = pa.array(_HEX_BYTES[raw].view("S32").ravel()).cast(pa.string())
+    groups = [
+        pc.utf8_slice_codeunits(digits, start, stop)
+        for start, stop in ((0, 8), (8, 12), (12, 16), (16, 20), (20, 32))
+    ]
+    return pc.binary_join_element_wise(*groups, "-")
+
+
+def ipv4_strings(rng: np.random.Generator, n: int) -> pa.Array:
+    octets = rng.integers(1, 255, size=(4, n))
+    return pc.binary_join_element_wise(*(pa.array(o).cast(pa.string()) for o in octets), ".")
+
+
+def coded_strings(rng: np.random.Generator, prefix: str, low: int, high: int, n: int) -> pa.Array:
+    """Strings like REF1234: a fixed prefix plus a random integer in [low, high]."""
+    numbers = pa.array(rng.integers(low, high, size=n, endpoint=True)).cast(pa.string())
+    return pc.binary_join_element_wise(prefix, numbers, "")
+
+
+def company_names(rng: np.random.Generator, vocab: Vocabulary, n: int) -> pa.Array:
+    """Faker's company formats, assembled from last names so the name space scales with n."""
+    first, second, third = (choice(rng, vocab.last_names, n) for _ in range(3))
+    return pc.choose(
+        pa.array(rng.integers(0, 3, n)),
+        pc.binary_join_element_wise(first, choice(rng, vocab.company_suffixes, n), " "),
+        pc.binary_join_element_wise(first, second, "-"),
+        pc.binary_join_element_wise(pc.binary_join_element_wise(first, second, ", "), third, " and "),
+    )
+
+
+def where(valid: np.ndarray, values: pa.Array) -> pa.Array:
+    """Null out values where valid is False."""
+    return pc.if_else(pa.array(valid), values, pa.scalar(None, values.type))
+
+
+def constant(value, n: int, type_=None) -> pa.Array:
+    return pa.repeat(pa.scalar(value, type_), n)
+
+
+def repeat_by_count(counts: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Parent index and 0-based position within parent for counts[i] children each."""
+    parent = np.repeat(np.arange(len(counts)), counts)
+    starts = np.cumsum(counts) - counts
+    position = np.arange(len(parent)) - starts[parent]
+    return parent, position
+
+
+def clear_output(name: str, data_dir: Path) -> None:
+    """Remove a table's output from a previous run, in either layout."""
+    (data_dir / f"{name}.parquet").unlink(missing_ok=True)
+    if (data_dir / name).is_dir():
+        shutil.rmtree(data_dir / name)
+
+
+class ParquetSink:
+    """
+    Streams batches of one source table to data/{name}.parquet.
+
+    Batches are buffered until a full row group is available, so every
+    row group except the last holds exactly row_group_size rows no matter
+    how the generator chunks its output. In the directory layout the
+    table is written as data/{name}/{basename}.parquet, and partitioned
+    tables as data/{name}/event_date=YYYY-MM-DD/{basename}-*.parquet.
+    """
+
+    def __init__(self, name: str, options: ParquetOptions, basename: str = "part-00000"):
+        self.name = name
+        self.options = options
+        self.basename = basename
+        self.partition_by = PARTITIONED_TABLES.get(name) if options.partition_events else None
+        self.rows = 0
+        self._pending: list[pa.Table] = []
+        self._pending_rows = 0
+        self._flushes = 0
+        self._writer: pq.ParquetWriter | None = None
+
+    def write(self, table: pa.Table) -> None:
+        if table.num_rows == 0:
+            return
+        if self.partition_by:
+            event_date = pc.cast(table[self.partition_by], pa.date32())
+            table = table.append_column(PARTITION_COLUMN, event_date)
+        self._pending.append(table)
+        self._pending_rows += table.num_rows
+        self.rows += table.num_rows
+        if self._pending_rows >= self.options.row_group_size:
+            self._flush(final=False)
+
+    def close(self) -> None:
+        self._flush(final=True)
+        if self._writer is not None:
+            self._writer.close()
+
+    def _flush(self, final: bool) -> None:
+        if not self._pending:
+            return
+        buffered = pa.concat_tables(self._pending)
+        size = self.options.row_group_size
+        ready = buffered.num_rows if final else buffered.num_rows - buffered.num_rows % size
+        self._pending = [buffered.slice(ready)] if ready < buffered.num_rows else []
+        self._pending_rows = buffered.num_rows - ready
+        if ready:
+            self._write(buffered.slice(0, ready))
+
+    def _write(self, table: pa.Table) -> None:
+        compression = None if self.options.compression == "none" else self.options.compression
+        if self.partition_by:
+            file_format = ds.ParquetFileFormat()
+            ds.write_dataset(
+                table,
+                self.options.data_dir / self.name,
+                format=file_format,
+                file_options=file_format.make_write_options(compression=compression),
+                partitioning=[PARTITION_COLUMN],
+                partitioning_flavor="hive",
+                basename_template=f"{self.basename}-{self._flushes}-{{i}}.parquet",
+                max_rows_per_group=self.options.row_group_size,
+                existing_data_behavior="overwrite_or_ignore",
+            )
+        else:
+            if self._writer is None:
+                if self.options.directory_layout:
+                    path = self.options.data_dir / self.name / f"{self.basename}.parquet"
+                    path.parent.mkdir(exist_ok=True)
+                else:
+                    path = self.options.data_dir / f"{self.name}.parquet"
+                self._writer = pq.ParquetWriter(path, table.schema, compression=compression)
+            self._writer.write_table(table, row_group_size=self.options.row_group_size)
+        self._flushes += 1
+
+
+def table_files(name: str, data_dir: Path) -> list[Path]:
+    """A table's Parquet files, in either layout."""
+    if (data_dir / name).is_dir():
+        return sorted((data_dir / name).rglob("*.parquet"))
+    path = data_dir / f"{name}.parquet"
+    return [path] if path.exists() else []
+
+
+def write_manifest(data_dir: Path) -> None:
+    """Record each table's files, rows and latest loaded_at from the Parquet footers."""
+    tables = {}
+    for names in SOURCE_TABLES.values():
+        for name in names:
+            files = table_files(name, data_dir)
+            rows = 0
+            latest = None
+            for path in files:
+                metadata = pq.ParquetFile(path).metadata
+                rows += metadata.num_rows
+                column = metadata.schema.names.index(LOADED_AT_COLUMN)
+                for row_group in range(metadata.num_row_groups):
+                    statistics = metadata.row_group(row_group).column(column).statistics
+                    if statistics is not None and statistics.has_min_max:
+                        latest = statistics.max if latest is None else max(latest, statistics.max)
+            if files:
+                tables[name] = {
+                    "files": len(files),
+                    "rows": rows,
+                    "max_loaded_at": latest.isoformat() if latest is not None else None,
+                }
+    (data_dir / MANIFEST_FILE).write_text(json.dumps({"tables": tables}, indent=2) + "\n")
 
 
 # ---------------------------------------------------------------------------
 # Generators
 # ---------------------------------------------------------------------------
 
-def generate_users() -> list[dict]:
-    now = datetime.now()
-    users = []
-    for i in range(1, NUM_USERS + 1):
-        created_at = random_date_weighted_recent(START_DATE, END_DATE - timedelta(days=30))
-        updated_at = random_date(created_at, min(created_at + timedelta(days=180), END_DATE))
-        last_login = random_date(created_at, END_DATE) if random.random() > 0.1 else None
-        trial_started = created_at if random.random() > 0.3 else None
-        trial_ended = (created_at + timedelta(days=14)) if trial_started and random.random() > 0.4 else None
-
-        users.append({
-            "id": i,
-            "email": fake.unique.email(),
-            "first_name": fake.first_name(),
-            "last_name": fake.last_name(),
-            "account_tier": random.choice(["free", "starter", "professional", "enterprise"]),
-            "account_status": random.choices(
-                ["active", "inactive", "suspended", "churned"],
-                weights=[0.6, 0.15, 0.05, 0.2],
-            )[0],
-            "company_name": fake.company(),
-            "company_size": random.choice(COMPANY_SIZES),
-            "industry": random.choice(INDUSTRIES),
-            "uses_cloud_sync": random.random() < 0.6,
-            "uses_team_chat": random.random() < 0.5,
-            "uses_data_hub": random.random() < 0.3,
-            "country_code": fake.country_code(),
-            "timezone": fake.timezone(),
-            "created_at": iso(created_at),
-            "updated_at": iso(updated_at),
-            "last_login_at": iso(last_login),
-            "trial_started_at": iso(trial_started),
-            "trial_ended_at": iso(trial_ended),
-            "signup_source": random.choice(SIGNUP_SOURCES),
-            "utm_source": random.choice(UTM_SOURCES),
-            "utm_medium": random.choice(UTM_MEDIUMS),
-            "utm_campaign": f"campaign_{random.randint(1, 20)}",
-            "referral_code": f"REF{random.randint(1000, 9999)}" if random.random() > 0.7 else None,
-            "is_test_user": False,
-            "is_internal_user": random.random() < 0.02,
-            "email_verified": random.random() > 0.05,
-            "phone_verified": random.random() > 0.6,
-            "deleted_at": None,
-            "loaded_at": iso(now),
-        })
-    return users
-
-
-def generate_subscriptions(users: list[dict]) -> list[dict]:
-    now = datetime.now()
-    subscriptions = []
-    sub_id = 1
-
-    for user in users:
-        if random.random() > 0.3:  # 70% have subscriptions
-            num_subs = random.choices([1, 2, 3], weights=[0.7, 0.25, 0.05])[0]
-            for _ in range(num_subs):
-                product = random.choice(PRODUCTS)
-                plan = random.choice(PLANS)
-                billing_period = random.choice(BILLING_PERIODS)
-                created_at = datetime.fromisoformat(user["created_at"]) + timedelta(
-                    days=random.randint(0, 7)
-                )
-                if created_at > END_DATE:
-                    created_at = END_DATE - timedelta(days=1)
-                trial_end = created_at + timedelta(days=14)
-
-                roll = random.random()
-                if roll < 0.15:
-                    status = "trial"
-                    canceled_at = None
-                    ended_at = None
-                elif roll < 0.25:
-                    status = "canceled"
-                    canceled_at = random_date(
-                        created_at + timedelta(days=30),
-                        min(created_at + timedelta(days=365), END_DATE),
-                    )
-                    ended_at = canceled_at + timedelta(days=30)
-                    if ended_at > END_DATE:
-                        ended_at = END_DATE
-                elif roll < 0.30:
-                    status = "past_due"
-                    canceled_at = None
-                    ended_at = None
-                elif roll < 0.35:
-                    status = "expired"
-                    canceled_at = None
-                    ended_at = random_date(
-                        created_at + timedelta(days=60),
-                        min(created_at + timedelta(days=365), END_DATE),
-                    )
-                else:
-                    status = "active"
-                    canceled_at = None
-                    ended_at = None
-
-                amount_cents = PRICING.get((product, plan, billing_period), 1999)
-                discount = int(amount_cents * random.uniform(0, 0.3)) if random.random() > 0.7 else 0
-
-                period_days = 30 if billing_period == "monthly" else 365
-                period_end = created_at + timedelta(days=period_days)
-
-                subscriptions.append({
-                    "id": sub_id,
-                    "user_id": user["id"],
-                    "plan_id": PLANS.index(plan) * 6 + PRODUCTS.index(product) * 2 + (
-                        1 if billing_period == "monthly" else 2
-                    ),
-                    "product": product,
-                    "plan_name": plan,
-                    "billing_period": billing_period,
-                    "amount_cents": amount_cents,
-                    "discount_cents": discount,
-                    "status": status,
-                    "quantity": random.randint(1, 20),
-                    "trial_start_date": iso(created_at) if status == "trial" else None,
-                    "trial_end_date": iso(trial_end) if status == "trial" else None,
-                    "current_period_start": iso(created_at),
-                    "current_period_end": iso(period_end),
-                    "cancel_at_period_end": status == "canceled",
-                    "canceled_at": iso(canceled_at),
-                    "ended_at": iso(ended_at),
-                    "created_at": iso(created_at),
-                    "updated_at": iso(created_at),
-                    "stripe_subscription_id": f"sub_{uuid.uuid4().hex[:24]}",
-                    "promo_code": f"PROMO{random.randint(10, 99)}" if discount > 0 else None,
-                    "payment_method": random.choice(["card", "invoice", "bank_transfer"]),
-                    "deleted_at": None,
-                    "loaded_at": iso(now),
-                })
-                sub_id += 1
-
-    return subscriptions
-
-
-def generate_usage_events(users: list[dict]) -> list[dict]:
-    now = datetime.now()
-    events = []
-    event_id = 1
-
-    for user in users:
-        if user["account_status"] not in ("active", "inactive"):
-            continue
-        created_at = datetime.fromisoformat(user["created_at"])
-        num_events = random.randint(20, 200)
-
-        for _ in range(num_events):
-            event_ts = random_date(created_at, END_DATE)
-            event_type = random.choice(EVENT_TYPES)
-            product = random.choice(PRODUCTS)
-
-            events.append({
-                "id": event_id,
-                "user_id": user["id"],
-                "event_type": event_type,
-                "product": product,
-                "event_timestamp": iso(event_ts),
-                "session_id": f"sess_{uuid.uuid4().hex[:16]}",
-                "page_url": f"/{product}/{fake.uri_path()}" if event_type == "page_view" else None,
-                "feature_name": random.choice([
-                    "file_sync", "version_history", "channels", "dashboards",
-                    "sql_editor", "api_access",
-                ]) if event_type == "feature_used" else None,
-                "duration_seconds": random.randint(1, 3600) if event_type in (
-                    "page_view", "dashboard_viewed"
-                ) else None,
-                "properties": f'{{"source": "{random.choice(["web", "mobile", "api"])}"}}',
-                "loaded_at": iso(now),
-            })
-            event_id += 1
-
-            if len(events) >= 50000:
-                return events
-
-    return events
-
-
-def generate_stripe_customers(users: list[dict]) -> list[dict]:
-    now = datetime.now()
-    customers = []
-    for user in users:
-        if random.random() > 0.15:  # 85% have stripe customers
-            created_at = datetime.fromisoformat(user["created_at"])
-            customers.append({
-                "id": f"cus_{uuid.uuid4().hex[:24]}",
-                "email": user["email"],
-                "name": f"{user['first_name']} {user['last_name']}",
-                "description": user["company_name"],
-                "currency": "usd",
-                "default_payment_method": f"pm_{uuid.uuid4().hex[:24]}",
-                "created": int(created_at.timestamp()),
-                "livemode": True,
-                "delinquent": random.random() < 0.05,
-                "metadata_user_id": str(user["id"]),
-                "loaded_at": iso(now),
-            })
-    return customers
-
-
-def generate_stripe_charges(subscriptions: list[dict]) -> list[dict]:
-    now = datetime.now()
-    charges = []
-    charge_id = 1
-
-    for sub in subscriptions:
-        if sub["status"] in ("trial",):
-            continue
-        created_at = datetime.fromisoformat(sub["created_at"])
-        num_charges = random.randint(1, 12)
-
-        for i in range(num_charges):
-            charge_ts = created_at + timedelta(days=30 * i)
-            if charge_ts > END_DATE:
-                break
-
-            roll = random.random()
-            if roll < 0.85:
-                status = "succeeded"
-            elif roll < 0.92:
-                status = "failed"
-            elif roll < 0.97:
-                status = "refunded"
-            else:
-                status = "pending"
-
-            amount = sub["amount_cents"] - sub["discount_cents"]
-            charges.append({
-                "id": f"ch_{uuid.uuid4().hex[:24]}",
-                "amount": amount,
-                "amount_refunded": amount if status == "refunded" else 0,
-                "currency": "usd",
-                "customer_id": sub.get("stripe_subscription_id", "").replace("sub_", "cus_"),
-                "subscription_id": sub["stripe_subscription_id"],
-                "status": status,
-                "paid": status == "succeeded",
-                "failure_code": "card_declined" if status == "failed" else None,
-                "failure_message": "Your card was declined." if status == "failed" else None,
-                "created": int(charge_ts.timestamp()),
-                "loaded_at": iso(now),
-            })
-            charge_id += 1
-
-    return charges
-
-
-def generate_stripe_invoices(subscriptions: list[dict]) -> list[dict]:
-    now = datetime.now()
-    invoices = []
-
-    for sub in subscriptions:
-        if sub["status"] == "trial":
-            continue
-        created_at = datetime.fromisoformat(sub["created_at"])
-        num_invoices = random.randint(1, 12)
-
-        for i in range(num_invoices):
-            invoice_ts = created_at + timedelta(days=30 * i)
-            if invoice_ts > END_DATE:
-                break
-
-            period_start = invoice_ts
-            period_end = invoice_ts + timedelta(
-                days=30 if sub["billing_period"] == "monthly" else 365
-            )
-
-            amount = sub["amount_cents"] - sub["discount_cents"]
-            roll = random.random()
-            if roll < 0.88:
-                status = "paid"
-            elif roll < 0.95:
-                status = "open"
-            elif roll < 0.98:
-                status = "void"
-            else:
-                status = "uncollectible"
-
-            invoices.append({
-                "id": f"in_{uuid.uuid4().hex[:24]}",
-                "customer_id": sub.get("stripe_subscription_id", "").replace("sub_", "cus_"),
-                "subscription_id": sub["stripe_subscription_id"],
-                "status": status,
-                "currency": "usd",
-                "amount_due": amount,
-                "amount_paid": amount if status == "paid" else 0,
-                "amount_remaining": 0 if status == "paid" else amount,
-                "subtotal": amount,
-                "tax": int(amount * 0.08) if random.random() > 0.5 else 0,
-                "total": amount,
-                "period_start": int(period_start.timestamp()),
-                "period_end": int(period_end.timestamp()),
-                "due_date": int((invoice_ts + timedelta(days=30)).timestamp()),
-                "created": int(invoice_ts.timestamp()),
-                "loaded_at": iso(now),
-            })
-
-    return invoices
-
-
-def generate_segment_tracks(users: list[dict]) -> list[dict]:
-    now = datetime.now()
-    tracks = []
-
-    track_events = [
-        "Signed Up", "Logged In", "Plan Upgraded", "Plan Downgraded",
-        "Feature Activated", "File Uploaded", "Dashboard Created",
-        "Report Exported", "Invite Sent", "Settings Updated",
-        "Integration Connected", "Subscription Canceled",
+def generate_users(ctx: GenerationContext, num_users: int, created_at: np.ndarray | None = None) -> pa.Table:
+    rng, vocab, n = ctx.rng, ctx.vocab, num_users
+
+    if created_at is None:
+        created_at = random_weighted_recent(rng, ctx.start_ts, ctx.end_ts - 30 * DAY, n)
+    updated_at = random_between(rng, created_at, np.minimum(created_at + 180 * DAY, ctx.end_ts))
+    last_login = random_between(rng, created_at, np.full(n, ctx.end_ts))
+    has_login = rng.random(n) > 0.1
+    has_trial = rng.random(n) > 0.3
+    trial_ended = has_trial & (rng.random(n) > 0.4)
+
+    ids = ctx.allocate_ids("users", n)
+    first_names = choice(rng, vocab.first_names, n)
+    last_names = choice(rng, vocab.last_names, n)
+    emails = pc.binary_join_element_wise(
+        pc.utf8_lower(first_names), ".", pc.utf8_lower(last_names),
+        pa.array(ids).cast(pa.string()), "@", choice(rng, vocab.email_domains, n),
+        "",
+    )
+
+    return pa.table({
+        "id": ids,
+        "email": emails,
+        "first_name": first_names,
+        "last_name": last_names,
+        "account_tier": choice(rng, ACCOUNT_TIERS, n),
+        "account_status": choice(
+            rng, ACCOUNT_STATUSES, n,
+            p=[0.6, 0.15, 0.05, 0.2],
+        ),
+        "company_name": company_names(rng, vocab, n),
+        "company_size": choice(rng, COMPANY_SIZES, n),
+        "industry": choice(rng, INDUSTRIES, n),
+        "uses_cloud_sync": rng.random(n) < 0.6,
+        "uses_team_chat": rng.random(n) < 0.5,
+        "uses_data_hub": rng.random(n) < 0.3,
+        "country_code": choice(rng, vocab.country_codes, n),
+        "timezone": choice(rng, vocab.timezones, n),
+        "created_at": timestamps(created_at),
+        "updated_at": timestamps(updated_at),
+        "last_login_at": timestamps(last_login, has_login),
+        "trial_started_at": timestamps(created_at, has_trial),
+        "trial_ended_at": timestamps(created_at + 14 * DAY, trial_ended),
+        "signup_source": choice(rng, SIGNUP_SOURCES, n),
+        "utm_source": choice(rng, UTM_SOURCES, n),
+        "utm_medium": choice(rng, UTM_MEDIUMS, n),
+        "utm_campaign": coded_strings(rng, "campaign_", 1, 20, n),
+        "referral_code": where(rng.random(n) > 0.7, coded_strings(rng, "REF", 1000, 9999, n)),
+        "is_test_user": np.zeros(n, dtype=bool),
+        "is_internal_user": rng.random(n) < 0.02,
+        "email_verified": rng.random(n) > 0.05,
+        "phone_verified": rng.random(n) > 0.6,
+        "deleted_at": pa.nulls(n),
+        "loaded_at": constant(ctx.loaded_at, n),
+    })
+
+
+def generate_subscriptions(ctx: GenerationContext, users: pa.Table) -> pa.Table:
+    rng = ctx.rng
+
+    # 70% of users have 1-3 subscriptions
+    has_subscription = rng.random(users.num_rows) > 0.3
+    counts = np.where(has_subscription, rng.choice([1, 2, 3], size=users.num_rows, p=[0.7, 0.25, 0.05]), 0)
+    owner, _ = repeat_by_count(counts)
+    n = len(owner)
+
+    product = rng.integers(0, len(PRODUCTS), n)
+    plan = rng.integers(0, len(PLANS), n)
+    billing = rng.integers(0, len(BILLING_PERIODS), n)
+
+    created_at = epoch_seconds(users["created_at"])[owner] + rng.integers(0, 7, n, endpoint=True) * DAY
+    created_at = np.where(created_at > ctx.end_ts, ctx.end_ts - DAY, created_at)
+
+    roll = rng.random(n)
+    status = np.select(
+        [roll < 0.15, roll < 0.25, roll < 0.30, roll < 0.35],
+        [0, 3, 2, 4],
+        default=1,
+    )
+    is_trial = status == 0
+    is_canceled = status == 3
+    is_expired = status == 4
+
+    within_year = np.minimum(created_at + 365 * DAY, ctx.end_ts)
+    canceled_at = random_between(rng, created_at + 30 * DAY, within_year)
+    ended_at = np.where(
+        is_canceled,
+        np.minimum(canceled_at + 30 * DAY, ctx.end_ts),
+        random_between(rng, created_at + 60 * DAY, within_year),
+    )
+
+    amount_cents = PRICE_GRID[product, plan, billing]
+    has_discount = rng.random(n) > 0.7
+    discount_cents = np.where(has_discount, (amount_cents * rng.uniform(0, 0.3, n)).astype(np.int64), 0)
+    period_days = np.where(billing == 0, 30, 365)
+
+    return pa.table({
+        "id": ctx.allocate_ids("subscriptions", n),
+        "user_id": users["id"].take(owner),
+        "plan_id": plan * 6 + product * 2 + billing + 1,
+        "product": pa.array(PRODUCTS).take(product),
+        "plan_name": pa.array(PLANS).take(plan),
+        "billing_period": pa.array(BILLING_PERIODS).take(billing),
+        "amount_cents": amount_cents,
+        "discount_cents": discount_cents,
+        "status": pa.array(SUBSCRIPTION_STATUSES).take(status),
+        "quantity": rng.integers(1, 20, n, endpoint=True),
+        "trial_start_date": timestamps(created_at, is_trial),
+        "trial_end_date": timestamps(created_at + 14 * DAY, is_trial),
+        "current_period_start": timestamps(created_at),
+        "current_period_end": timestamps(created_at + period_days * DAY),
+        "cancel_at_period_end": is_canceled,
+        "canceled_at": timestamps(canceled_at, is_canceled),
+        "ended_at": timestamps(ended_at, is_canceled | is_expired),
+        "created_at": timestamps(created_at),
+        "updated_at": timestamps(created_at),
+        "stripe_subscription_id": hex_ids(rng, n, 24, "sub_"),
+        "promo_code": where(discount_cents > 0, coded_strings(rng, "PROMO", 10, 99, n)),
+        "payment_method": choice(rng, ["card", "invoice", "bank_transfer"], n),
+        "deleted_at": pa.nulls(n),
+        "loaded_at": constant(ctx.loaded_at, n),
+    })
+
+
+def generate_usage_events(ctx: GenerationContext, users: pa.Table) -> pa.Table:
+    rng, vocab = ctx.rng, ctx.vocab
+
+    eligible = pc.is_in(users["account_status"], pa.array(["active", "inactive"])).to_numpy(zero_copy_only=False)
+    counts = np.where(eligible, rng.integers(20, 200, users.num_rows, endpoint=True), 0)
+    created_at = epoch_seconds(users["created_at"])
+    owner, _ = repeat_by_count(ctx.scale_to_window(counts, created_at))
+    n = len(owner)
+
+    event_ts = random_between(rng, np.maximum(created_at, ctx.start_ts)[owner], np.full(n, ctx.end_ts))
+    event_type = rng.integers(0, len(EVENT_TYPES), n)
+    product = pa.array(PRODUCTS).take(rng.integers(0, len(PRODUCTS), n))
+    is_page_view = event_type == EVENT_TYPES.index("page_view")
+    is_feature_used = event_type == EVENT_TYPES.index("feature_used")
+    has_duration = is_page_view | (event_type == EVENT_TYPES.index("dashboard_viewed"))
+    page_url = pc.binary_join_element_wise("", product, choice(rng, vocab.uri_paths, n), "/")
+    properties = [f'{{"source": "{source}"}}' for source in ["web", "mobile", "api"]]
+
+    return pa.table({
+        "id": ctx.allocate_ids("usage_events", n),
+        "user_id": users["id"].take(owner),
+        "event_type": pa.array(EVENT_TYPES).take(event_type),
+        "product": product,
+        "event_timestamp": timestamps(event_ts),
+        "session_id": hex_ids(rng, n, 16, "sess_"),
+        "page_url": where(is_page_view, page_url),
+        "feature_name": where(is_feature_used, choice(rng, FEATURE_NAMES, n)),
+        "duration_seconds": pa.array(rng.integers(1, 3600, n, endpoint=True), mask=~has_duration),
+        "properties": choice(rng, properties, n),
+        "loaded_at": constant(ctx.loaded_at, n),
+    })
+
+
+def generate_stripe_customers(ctx: GenerationContext, users: pa.Table) -> pa.Table:
+    rng = ctx.rng
+
+    # 85% of users have stripe customers
+    users = users.filter(rng.random(users.num_rows) > 0.15)
+    n = users.num_rows
+
+    return pa.table({
+        "id": hex_ids(rng, n, 24, "cus_"),
+        "email": users["email"],
+        "name": pc.binary_join_element_wise(users["first_name"], users["last_name"], " "),
+        "description": users["company_name"],
+        "currency": constant("usd", n),
+        "default_payment_method": hex_ids(rng, n, 24, "pm_"),
+        "created": epoch_seconds(users["created_at"]),
+        "livemode": np.ones(n, dtype=bool),
+        "delinquent": rng.random(n) < 0.05,
+        "metadata_user_id": users["id"].cast(pa.string()),
+        "loaded_at": constant(ctx.loaded_at, n),
+    })
+
+
+def billing_cycles(ctx: GenerationContext, subscriptions: pa.Table) -> tuple[pa.Table, np.ndarray]:
+    """Expand non-trial subscriptions into 1-12 monthly cycles that start before END_DATE."""
+    rng = ctx.rng
+    subscriptions = subscriptions.filter(pc.not_equal(subscriptions["status"], "trial"))
+    counts = rng.integers(1, 12, subscriptions.num_rows, endpoint=True)
+    parent, cycle = repeat_by_count(counts)
+
+    cycle_ts = epoch_seconds(subscriptions["created_at"])[parent] + cycle * 30 * DAY
+    in_range = cycle_ts <= ctx.end_ts
+    return subscriptions.take(parent[in_range]), cycle_ts[in_range]
+
+
+def window_billing_cycles(ctx: GenerationContext, subscriptions: pa.Table) -> tuple[pa.Table, np.ndarray]:
+    """The 30-day cycles of billable subscriptions that start inside the context window."""
+    billable = pc.is_in(subscriptions["status"], pa.array(["active", "past_due"]))
+    subscriptions = subscriptions.filter(billable)
+    created_at = epoch_seconds(subscriptions["created_at"])
+
+    period = 30 * DAY
+    first = np.maximum((ctx.start_ts - created_at) // period + 1, 0)
+    last = (ctx.end_ts - created_at) // period
+    parent, position = repeat_by_count(np.maximum(last - first + 1, 0))
+    return subscriptions.take(parent), created_at[parent] + (first[parent] + position) * period
+
+
+def generate_stripe_charges(
+    ctx: GenerationContext,
+    subscriptions: pa.Table,
+    cycles: tuple[pa.Table, np.ndarray] | None = None,
+) -> pa.Table:
+    rng = ctx.rng
+    cycles, charge_ts = cycles or billing_cycles(ctx, subscriptions)
+    n = cycles.num_rows
+
+    roll = rng.random(n)
+    status = np.select([roll < 0.85, roll < 0.92, roll < 0.97], [0, 1, 2], default=3)
+    is_failed = status == 1
+    amount = pc.subtract(cycles["amount_cents"], cycles["discount_cents"])
+
+    return pa.table({
+        "id": hex_ids(rng, n, 24, "ch_"),
+        "amount": amount,
+        "amount_refunded": pc.if_else(pa.array(status == 2), amount, 0),
+        "currency": constant("usd", n),
+        "customer_id": pc.replace_substring(cycles["stripe_subscription_id"], "sub_", "cus_"),
+        "subscription_id": cycles["stripe_subscription_id"],
+        "status": pa.array(CHARGE_STATUSES).take(status),
+        "paid": status == 0,
+        "failure_code": where(is_failed, constant("card_declined", n)),
+        "failure_message": where(is_failed, constant("Your card was declined.", n)),
+        "created": charge_ts,
+        "loaded_at": constant(ctx.loaded_at, n),
+    })
+
+
+def generate_stripe_invoices(
+    ctx: GenerationContext,
+    subscriptions: pa.Table,
+    cycles: tuple[pa.Table, np.ndarray] | None = None,
+) -> pa.Table:
+    rng = ctx.rng
+    cycles, invoice_ts = cycles or billing_cycles(ctx, subscriptions)
+    n = cycles.num_rows
+
+    is_monthly = pc.equal(cycles["billing_period"], "monthly").to_numpy(zero_copy_only=False)
+    amount = pc.subtract(cycles["amount_cents"], cycles["discount_cents"]).to_numpy()
+    roll = rng.random(n)
+    status = np.select([roll < 0.88, roll < 0.95, roll < 0.98], [0, 1, 2], default=3)
+    is_paid = status == 0
+    has_tax = rng.random(n) > 0.5
+
+    return pa.table({
+        "id": hex_ids(rng, n, 24, "in_"),
+        "customer_id": pc.replace_substring(cycles["stripe_subscription_id"], "sub_", "cus_"),
+        "subscription_id": cycles["stripe_subscription_id"],
+        "status": pa.array(INVOICE_STATUSES).take(status),
+        "currency": constant("usd", n),
+        "amount_due": amount,
+        "amount_paid": np.where(is_paid, amount, 0),
+        "amount_remaining": np.where(is_paid, 0, amount),
+        "subtotal": amount,
+        "tax": np.where(has_tax, (amount * 0.08).astype(np.int64), 0),
+        "total": amount,
+        "period_start": invoice_ts,
+        "period_end": invoice_ts + np.where(is_monthly, 30, 365) * DAY,
+        "due_date": invoice_ts + 30 * DAY,
+        "created": invoice_ts,
+        "loaded_at": constant(ctx.loaded_at, n),
+    })
+
+
+def generate_segment_tracks(ctx: GenerationContext, users: pa.Table) -> pa.Table:
+    rng, vocab = ctx.rng, ctx.vocab
+
+    # Most churned users stop sending events
+    is_churned = pc.equal(users["account_status"], "churned").to_numpy(zero_copy_only=False)
+    keep = ~(is_churned & (rng.random(users.num_rows) > 0.3))
+    counts = np.where(keep, rng.integers(5, 50, users.num_rows, endpoint=True), 0)
+    created_at = epoch_seconds(users["created_at"])
+    owner, _ = repeat_by_count(ctx.scale_to_window(counts, created_at))
+    n = len(owner)
+
+    event_ts = random_between(rng, np.maximum(created_at, ctx.start_ts)[owner], np.full(n, ctx.end_ts))
+
+    return pa.table({
+        "id": uuid4_strings(rng, n),
+        "user_id": users["id"].take(owner).cast(pa.string()),
+        "anonymous_id": hex_ids(rng, n, 16, "anon_"),
+        "event": choice(rng, TRACK_EVENTS, n),
+        "timestamp": timestamps(event_ts),
+        "received_at": timestamps(event_ts + rng.integers(0, 60, n, endpoint=True)),
+        "context_page_url": pc.binary_join_element_wise(
+            "https://app.techflow.io", choice(rng, PRODUCTS, n), "/",
+        ),
+        "context_user_agent": choice(rng, vocab.user_agents, n),
+        "context_ip": ipv4_strings(rng, n),
+        "context_locale": choice(rng, ["en-US", "en-GB", "de-DE", "fr-FR", "ja-JP"], n),
+        "loaded_at": constant(ctx.loaded_at, n),
+    })
+
+
+def generate_segment_identifies(ctx: GenerationContext, users: pa.Table) -> pa.Table:
+    rng = ctx.rng
+
+    # Most users have 1-3 identify calls
+    owner, _ = repeat_by_count(rng.integers(1, 3, users.num_rows, endpoint=True))
+    n = len(owner)
+    identified = users.take(owner)
+    identify_ts = random_between(rng, epoch_seconds(identified["created_at"]), np.full(n, ctx.end_ts))
+
+    return pa.table({
+        "id": uuid4_strings(rng, n),
+        "user_id": identified["id"].cast(pa.string()),
+        "anonymous_id": hex_ids(rng, n, 16, "anon_"),
+        "timestamp": timestamps(identify_ts),
+        "received_at": timestamps(identify_ts + rng.integers(0, 30, n, endpoint=True)),
+        "email": identified["email"],
+        "name": pc.binary_join_element_wise(identified["first_name"], identified["last_name"], " "),
+        "company_name": identified["company_name"],
+        "plan": identified["account_tier"],
+        "context_ip": ipv4_strings(rng, n),
+        "loaded_at": constant(ctx.loaded_at, n),
+    })
+
+
+def first_per_company(users: pa.Table) -> pa.Table:
+    """The first user seen for each company_name, in original order."""
+    companies = users["company_name"].to_numpy(zero_copy_only=False)
+    _, first_seen = np.unique(companies, return_index=True)
+    return users.take(np.sort(first_seen))
+
+
+def generate_salesforce_accounts(ctx: GenerationContext, users: pa.Table) -> pa.Table:
+    rng, vocab = ctx.rng, ctx.vocab
+
+    # One candidate per company (first user seen), only ~40% become SF accounts (enterprise focus)
+    candidates = first_per_company(users)
+    accounts = candidates.filter(rng.random(candidates.num_rows) <= 0.4)
+    n = accounts.num_rows
+
+    created_at = epoch_seconds(accounts["created_at"])
+
+    return pa.table({
+        "id": hex_ids(rng, n, 15, "001"),
+        "name": accounts["company_name"],
+        "type": choice(rng, ["Customer", "Prospect", "Partner"], n),
+        "industry": accounts["industry"],
+        "annual_revenue": choice(rng, [50000, 100000, 250000, 500000, 1000000, 5000000, 10000000], n),
+        "number_of_employees": choice(rng, [10, 25, 50, 100, 250, 500, 1000, 5000], n),
+        "billing_city": choice(rng, vocab.cities, n),
+        "billing_country": accounts["country_code"],
+        "owner_id": hex_ids(rng, n, 15, "005"),
+        "created_date": timestamps(created_at),
+        "last_modified_date": timestamps(random_between(rng, created_at, np.full(n, ctx.end_ts))),
+        "is_deleted": np.zeros(n, dtype=bool),
+        "loaded_at": constant(ctx.loaded_at, n),
+    })
+
+
+def generate_salesforce_opportunities(ctx: GenerationContext, accounts: pa.Table) -> pa.Table:
+    rng = ctx.rng
+
+    parent, _ = repeat_by_count(rng.integers(1, 3, accounts.num_rows, endpoint=True))
+    n = len(parent)
+    opportunity_accounts = accounts.take(parent)
+
+    created_at = epoch_seconds(opportunity_accounts["created_date"])
+    close_date = random_between(
+        rng, created_at + 14 * DAY, np.minimum(created_at + 180 * DAY, ctx.end_ts),
+    )
+    stage = rng.integers(0, len(OPPORTUNITY_STAGES), n)
+    stage_names = pa.array(OPPORTUNITY_STAGES).take(stage)
+    title = pc.binary_join_element_wise(
+        choice(rng, [p.title() for p in PRODUCTS], n),
+        choice(rng, [p.title() for p in PLANS], n),
+        " ",
+    )
+
+    return pa.table({
+        "id": hex_ids(rng, n, 15, "006"),
+        "account_id": opportunity_accounts["id"],
+        "name": pc.binary_join_element_wise(opportunity_accounts["name"], title, " - "),
+        "stage_name": stage_names,
+        "amount": choice(rng, [5000, 10000, 25000, 50000, 100000, 250000], n),
+        "probability": pa.array([STAGE_PROBABILITY[s] for s in OPPORTUNITY_STAGES]).take(stage),
+        "close_date": timestamps(close_date),
+        "type": choice(rng, ["New Business", "Expansion", "Renewal"], n),
+        "lead_source": choice(rng, ["Web", "Inbound", "Outbound", "Referral", "Partner"], n),
+        "is_won": pc.equal(stage_names, "Closed Won"),
+        "is_closed": pc.is_in(stage_names, pa.array(["Closed Won", "Closed Lost"])),
+        "owner_id": opportunity_accounts["owner_id"],
+        "created_date": timestamps(random_between(rng, created_at, close_date)),
+        "last_modified_date": timestamps(close_date),
+        "loaded_at": constant(ctx.loaded_at, n),
+    })
+
+
+def generate_shard(ctx: GenerationContext, num_users: int) -> dict[str, pa.Table]:
+    """Generate every per-user source table for one shard of users."""
+    users = generate_users(ctx, num_users)
+    subscriptions = generate_subscriptions(ctx, users)
+    return {
+        # app_db
+        "users": users,
+        "subscriptions": subscriptions,
+        "usage_events": generate_usage_events(ctx, users),
+        # stripe
+        "stripe_customers": generate_stripe_customers(ctx, users),
+        "stripe_charges": generate_stripe_charges(ctx, subscriptions),
+        "stripe_invoices": generate_stripe_invoices(ctx, subscriptions),
+        # segment
+        "segment_tracks": generate_segment_tracks(ctx, users),
+        "segment_identifies": generate_segment_identifies(ctx, users),
+    }
+
+
+def generate_salesforce(ctx: GenerationContext, company_users: pa.Table) -> dict[str, pa.Table]:
+    """Generate salesforce tables from the company columns of all users, in shard order."""
+    accounts = generate_salesforce_accounts(ctx, company_users)
+    return {
+        "salesforce_accounts": accounts,
+        "salesforce_opportunities": generate_salesforce_opportunities(ctx, accounts),
+    }
+
+
+def plan_shards(num_users: int, chunk_size: int) -> list[Shard]:
+    return [
+        Shard(index=i, first_user=first, num_users=min(chunk_size, num_users - first))
+        for i, first in enumerate(range(0, num_users, chunk_size))
     ]
 
-    for user in users:
-        if user["account_status"] == "churned" and random.random() > 0.3:
-            continue
-        created_at = datetime.fromisoformat(user["created_at"])
-        num_tracks = random.randint(5, 50)
-
-        for _ in range(num_tracks):
-            event_ts = random_date(created_at, END_DATE)
-            event = random.choice(track_events)
-
-            tracks.append({
-                "id": str(uuid.uuid4()),
-                "user_id": str(user["id"]),
-                "anonymous_id": f"anon_{uuid.uuid4().hex[:16]}",
-                "event": event,
-                "timestamp": iso(event_ts),
-                "received_at": iso(event_ts + timedelta(seconds=random.randint(0, 60))),
-                "context_page_url": f"https://app.techflow.io/{random.choice(PRODUCTS)}",
-                "context_user_agent": fake.user_agent(),
-                "context_ip": fake.ipv4(),
-                "context_locale": random.choice(["en-US", "en-GB", "de-DE", "fr-FR", "ja-JP"]),
-                "loaded_at": iso(now),
-            })
-
-    return tracks
-
-
-def generate_segment_identifies(users: list[dict]) -> list[dict]:
-    now = datetime.now()
-    identifies = []
-
-    for user in users:
-        created_at = datetime.fromisoformat(user["created_at"])
-        # Most users have 1-3 identify calls
-        num_identifies = random.randint(1, 3)
-
-        for i in range(num_identifies):
-            identify_ts = random_date(created_at, END_DATE)
-            identifies.append({
-                "id": str(uuid.uuid4()),
-                "user_id": str(user["id"]),
-                "anonymous_id": f"anon_{uuid.uuid4().hex[:16]}",
-                "timestamp": iso(identify_ts),
-                "received_at": iso(identify_ts + timedelta(seconds=random.randint(0, 30))),
-                "email": user["email"],
-                "name": f"{user['first_name']} {user['last_name']}",
-                "company_name": user["company_name"],
-                "plan": user["account_tier"],
-                "context_ip": fake.ipv4(),
-                "loaded_at": iso(now),
-            })
-
-    return identifies
-
-
-def generate_salesforce_accounts(users: list[dict]) -> list[dict]:
-    now = datetime.now()
-    accounts = []
-    seen_companies: set[str] = set()
-
-    for user in users:
-        company = user["company_name"]
-        if company in seen_companies:
-            continue
-        seen_companies.add(company)
-
-        # Only ~40% of companies become SF accounts (enterprise focus)
-        if random.random() > 0.4:
-            continue
-
-        created_at = datetime.fromisoformat(user["created_at"])
-        accounts.append({
-            "id": f"001{uuid.uuid4().hex[:15]}",
-            "name": company,
-            "type": random.choice(["Customer", "Prospect", "Partner"]),
-            "industry": user["industry"],
-            "annual_revenue": random.choice([
-                50000, 100000, 250000, 500000, 1000000, 5000000, 10000000,
-            ]),
-            "number_of_employees": random.choice([
-                10, 25, 50, 100, 250, 500, 1000, 5000,
-            ]),
-            "billing_city": fake.city(),
-            "billing_country": user["country_code"],
-            "owner_id": f"005{uuid.uuid4().hex[:15]}",
-            "created_date": iso(created_at),
-            "last_modified_date": iso(random_date(created_at, END_DATE)),
-            "is_deleted": False,
-            "loaded_at": iso(now),
-        })
-
-    return accounts
-
-
-def generate_salesforce_opportunities(accounts: list[dict]) -> list[dict]:
-    now = datetime.now()
-    opportunities = []
-
-    for account in accounts:
-        num_opps = random.randint(1, 3)
-        created_at = datetime.fromisoformat(account["created_date"])
-
-        for _ in range(num_opps):
-            close_date = random_date(
-                created_at + timedelta(days=14),
-                min(created_at + timedelta(days=180), END_DATE),
-            )
-            stage = random.choice(OPPORTUNITY_STAGES)
-            is_won = stage == "Closed Won"
-            is_closed = stage in ("Closed Won", "Closed Lost")
-            amount = random.choice([
-                5000, 10000, 25000, 50000, 100000, 250000,
-            ])
-
-            opportunities.append({
-                "id": f"006{uuid.uuid4().hex[:15]}",
-                "account_id": account["id"],
-                "name": f"{account['name']} - {random.choice(PRODUCTS).title()} {random.choice(PLANS).title()}",
-                "stage_name": stage,
-                "amount": amount,
-                "probability": {
-                    "Prospecting": 10,
-                    "Qualification": 20,
-                    "Needs Analysis": 40,
-                    "Proposal": 60,
-                    "Negotiation": 80,
-                    "Closed Won": 100,
-                    "Closed Lost": 0,
-                }[stage],
-                "close_date": iso(close_date),
-                "type": random.choice(["New Business", "Expansion", "Renewal"]),
-                "lead_source": random.choice([
-                    "Web", "Inbound", "Outbound", "Referral", "Partner",
-                ]),
-                "is_won": is_won,
-                "is_closed": is_closed,
-                "owner_id": account["owner_id"],
-                "created_date": iso(random_date(created_at, close_date)),
-                "last_modified_date": iso(close_date),
-                "loaded_at": iso(now),
-            })
-
-    return opportunities
-
-
-def main() -> None:
-    DATA_DIR.mkdir(exist_ok=True)
-
-    print("Generating TechFlow Analytics test data...")
-    print(f"  Users: {NUM_USERS}")
-    print(f"  Date range: {START_DATE.date()} to {END_DATE.date()}")
-    print()
 
-    # app_db
-    print("app_db:")
-    users = generate_users()
-    write_parquet("users", users)
+def run_shard(task: ShardTask) -> tuple[dict[str, int], pa.Table]:
+    """Worker entry point: write one shard's files and return row counts and company users."""
+    ctx = GenerationContext.for_shard(task.seed, task.vocab, task.loaded_at, task.shard)
+    tables = generate_shard(ctx, task.shard.num_users)
+    rows = {}
+    for name, table in tables.items():
+        sink = ParquetSink(name, task.options, basename=f"part-{task.shard.index:05d}")
+        sink.write(table)
+        sink.close()
+        rows[name] = sink.rows
+    company_users = first_per_company(tables["users"]).select(SALESFORCE_USER_COLUMNS)
+    return rows, company_users
+
+
+def generate_sequential(tasks: list[ShardTask], options: ParquetOptions) -> tuple[dict[str, int], list[pa.Table]]:
+    """Generate shards in this process, streaming each table into a single sink."""
+    sinks = {}
+    company_users = []
+    for task in tasks:
+        ctx = GenerationContext.for_shard(task.seed, task.vocab, task.loaded_at, task.shard)
+        tables = generate_shard(ctx, task.shard.num_users)
+        for name, table in tables.items():
+            sinks.setdefault(name, ParquetSink(name, options)).write(table)
+        company_users.append(first_per_company(tables["users"]).select(SALESFORCE_USER_COLUMNS))
+    for sink in sinks.values():
+        sink.close()
+    return {name: sink.rows for name, sink in sinks.items()}, company_users
+
+
+def generate_parallel(tasks: list[ShardTask], workers: int) -> tuple[dict[str, int], list[pa.Table]]:
+    """Generate shards in a process pool, one Parquet file per shard and table."""
+    rows: dict[str, int] = {}
+    company_users = []
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        for shard_rows, shard_company_users in pool.map(run_shard, tasks):
+            for name, count in shard_rows.items():
+                rows[name] = rows.get(name, 0) + count
+            company_users.append(shard_company_users)
+    return rows, company_users
 
-    subscriptions = generate_subscriptions(users)
-    write_parquet("subscriptions", subscriptions)
 
-    usage_events = generate_usage_events(users)
-    write_parquet("usage_events", usage_events)
+# ---------------------------------------------------------------------------
+# Incremental loads (--advance-days)
+# ---------------------------------------------------------------------------
 
-    # stripe
-    print("stripe:")
-    stripe_customers = generate_stripe_customers(users)
-    write_parquet("stripe_customers", stripe_customers)
+def write_state(state: dict, data_dir: Path) -> None:
+    (data_dir / STATE_FILE).write_text(json.dumps(state, indent=2) + "\n")
+
+
+def read_state(data_dir: Path) -> dict:
+    path = data_dir / STATE_FILE
+    if not path.exists():
+        raise SystemExit(f"No generator state at {path}; run a full generation before --advance-days")
+    return json.loads(path.read_text())
+
+
+def use_directory_layout(data_dir: Path) -> None:
+    """Move data/{name}.parquet files to data/{name}/part-00000.parquet so loads can add files beside them."""
+    for tables in SOURCE_TABLES.values():
+        for name in tables:
+            path = data_dir / f"{name}.parquet"
+            if path.exists():
+                (data_dir / name).mkdir(exist_ok=True)
+                path.rename(data_dir / name / "part-00000.parquet")
+
+
+def dbt_vars(data_dir: Path, directory_layout: bool) -> str:
+    """The --vars dbt needs to read what was written to data_dir, if any."""
+    pairs = []
+    if directory_layout:
+        pairs.append("source_layout: directory")
+    if data_dir.resolve() != DATA_DIR.resolve():
+        pairs.append(f"data_dir: {data_dir}")
+    return f" --vars '{{{', '.join(pairs)}}}'" if pairs else ""
+
+
+def read_source(name: str, data_dir: Path) -> pa.Table:
+    """Read a source table back as written."""
+    return ds.dataset(data_dir / name, format="parquet").to_table().combine_chunks()
+
+
+def happens(rng: np.random.Generator, n: int, daily_rate: float, days: int) -> np.ndarray:
+    """Whether an event with the given daily probability happens at least once in days."""
+    return rng.random(n) < 1 - (1 - daily_rate) ** days
+
+
+def step_level(rng: np.random.Generator, level: np.ndarray, levels: int) -> np.ndarray:
+    """Move each ordinal level one step up or down, staying within [0, levels)."""
+    step = rng.choice([-1, 1], size=len(level))
+    return np.where(level == 0, 1, np.where(level == levels - 1, levels - 2, level + step))
+
+
+def replace_where(table: pa.Table, name: str, mask: np.ndarray, values) -> pa.Table:
+    column = table[name]
+    values = values if isinstance(values, pa.Array) else pa.array(values)
+    updated = pc.if_else(pa.array(mask), values.cast(column.type), column)
+    return table.set_column(table.schema.get_field_index(name), name, updated)
+
+
+def advance_users(ctx: GenerationContext, users: pa.Table, days: int) -> pa.Table:
+    """Apply account status and tier changes, bumping updated_at on every changed row."""
+    rng, n = ctx.rng, users.num_rows
+    status = pc.index_in(users["account_status"], pa.array(ACCOUNT_STATUSES)).to_numpy(zero_copy_only=False)
+    tier = pc.index_in(users["account_tier"], pa.array(ACCOUNT_TIERS)).to_numpy(zero_copy_only=False)
+
+    is_active = status == ACCOUNT_STATUSES.index("active")
+    churns = is_active & happens(rng, n, 0.0005, days)
+    goes_inactive = is_active & ~churns & happens(rng, n, 0.001, days)
+    reactivates = (status == ACCOUNT_STATUSES.index("inactive")) & happens(rng, n, 0.01, days)
+    changes_tier = ~churns & (status != ACCOUNT_STATUSES.index("churned")) & happens(rng, n, 0.001, days)
+
+    new_status = np.select(
+        [churns, goes_inactive, reactivates],
+        [ACCOUNT_STATUSES.index(s) for s in ("churned", "inactive", "active")],
+        default=status,
+    )
+    new_tier = np.where(changes_tier, step_level(rng, tier, len(ACCOUNT_TIERS)), tier)
+    changed = churns | goes_inactive | reactivates | changes_tier
+    changed_at = random_between(rng, np.full(n, ctx.start_ts), np.full(n, ctx.end_ts))
+
+    users = replace_where(users, "account_status", changed, pa.array(ACCOUNT_STATUSES).take(new_status))
+    users = replace_where(users, "account_tier", changed, pa.array(ACCOUNT_TIERS).take(new_tier))
+    users = replace_where(users, "updated_at", changed, timestamps(changed_at))
+    return replace_where(users, "loaded_at", changed, constant(ctx.loaded_at, n))
+
+
+def advance_subscriptions(ctx: GenerationContext, subscriptions: pa.Table, days: int) -> pa.Table:
+    """
+    Move subscriptions through their lifecycle for the window.
+
+    Trials that end convert (70%) or expire, active subscriptions may
+    cancel, fall past due or change plan, and past-due ones recover or
+    lapse. Every changed row gets updated_at inside the window.
+    """
+    rng, n = ctx.rng, subscriptions.num_rows
+    status = pc.index_in(subscriptions["status"], pa.array(SUBSCRIPTION_STATUSES)).to_numpy(zero_copy_only=False)
+    trial_end = pc.fill_null(pc.cast(subscriptions["trial_end_date"], pa.timestamp("s")).cast(pa.int64()), 0).to_numpy()
+    changed_at = random_between(rng, np.full(n, ctx.start_ts), np.full(n, ctx.end_ts))
+
+    trial_over = (status == 0) & (trial_end <= ctx.end_ts)
+    converts = trial_over & (rng.random(n) < 0.7)
+    expires = trial_over & ~converts
+    changed_at = np.where(trial_over, np.maximum(trial_end, ctx.start_ts), changed_at)
+
+    is_active = status == 1
+    cancels = is_active & happens(rng, n, 0.002, days)
+    falls_past_due = is_active & ~cancels & happens(rng, n, 0.003, days)
+    changes_plan = is_active & ~cancels & ~falls_past_due & happens(rng, n, 0.001, days)
+    recovers = (status == 2) & happens(rng, n, 0.05, days)
+    lapses = (status == 2) & ~recovers & happens(rng, n, 0.01, days)
+    ends = cancels | lapses
+
+    new_status = np.select(
+        [converts | recovers, falls_past_due, ends, expires],
+        [1, 2, 3, 4],
+        default=status,
+    )
+    changed = trial_over | ends | falls_past_due | changes_plan | recovers
+
+    product = pc.index_in(subscriptions["product"], pa.array(PRODUCTS)).to_numpy(zero_copy_only=False)
+    plan = pc.index_in(subscriptions["plan_name"], pa.array(PLANS)).to_numpy(zero_copy_only=False)
+    billing = pc.index_in(subscriptions["billing_period"], pa.array(BILLING_PERIODS)).to_numpy(zero_copy_only=False)
+    new_plan = np.where(changes_plan, step_level(rng, plan, len(PLANS)), plan)
+    amount_cents = PRICE_GRID[product, new_plan, billing]
+    discount_cents = np.minimum(subscriptions["discount_cents"].to_numpy(), amount_cents)
+
+    subscriptions = replace_where(subscriptions, "status", changed, pa.array(SUBSCRIPTION_STATUSES).take(new_status))
+    subscriptions = replace_where(subscriptions, "plan_id", changes_plan, new_plan * 6 + product * 2 + billing + 1)
+    subscriptions = replace_where(subscriptions, "plan_name", changes_plan, pa.array(PLANS).take(new_plan))
+    subscriptions = replace_where(subscriptions, "amount_cents", changes_plan, amount_cents)
+    subscriptions = replace_where(subscriptions, "discount_cents", changes_plan, discount_cents)
+    subscriptions = replace_where(subscriptions, "cancel_at_period_end", ends, np.ones(n, dtype=bool))
+    subscriptions = replace_where(subscriptions, "canceled_at", ends, timestamps(changed_at))
+    ended_at = np.where(expires, changed_at, np.minimum(changed_at + 30 * DAY, ctx.end_ts))
+    subscriptions = replace_where(subscriptions, "ended_at", ends | expires, timestamps(ended_at))
+    subscriptions = replace_where(subscriptions, "updated_at", changed, timestamps(changed_at))
+    return replace_where(subscriptions, "loaded_at", changed, constant(ctx.loaded_at, n))
+
+
+def append_rows(existing: pa.Table, new: pa.Table) -> pa.Table:
+    return pa.concat_tables([existing, new.cast(existing.schema)])
+
+
+def generate_load(
+    ctx: GenerationContext,
+    days: int,
+    signups_per_day: float,
+    data_dir: Path,
+) -> dict[str, pa.Table]:
+    """Generate one --advance-days load: rewritten state tables plus the window's new facts."""
+    rng = ctx.rng
+    num_signups = int(rng.poisson(signups_per_day * days))
+    signup_ts = random_between(rng, np.full(num_signups, ctx.start_ts), np.full(num_signups, ctx.end_ts))
+    new_users = generate_users(ctx, num_signups, created_at=signup_ts)
+    new_subscriptions = generate_subscriptions(ctx, new_users)
+
+    users = append_rows(advance_users(ctx, read_source("users", data_dir), days), new_users)
+    subscriptions = append_rows(
+        advance_subscriptions(ctx, read_source("subscriptions", data_dir), days), new_subscriptions
+    )
+    cycles = window_billing_cycles(ctx, subscriptions)
+    return {
+        # app_db
+        "users": users,
+        "subscriptions": subscriptions,
+        "usage_events": generate_usage_events(ctx, users),
+        # stripe
+        "stripe_customers": generate_stripe_customers(ctx, new_users),
+        "stripe_charges": generate_stripe_charges(ctx, subscriptions, cycles),
+        "stripe_invoices": generate_stripe_invoices(ctx, subscriptions, cycles),
+        # segment
+        "segment_tracks": generate_segment_tracks(ctx, users),
+        "segment_identifies": generate_segment_identifies(ctx, new_users),
+    }
+
+
+def advance(args: argparse.Namespace, loaded_at: datetime) -> None:
+    state = read_state(args.output_dir)
+    load = state["loads"] + 1
+    ctx = GenerationContext(
+        rng=np.random.default_rng([state["seed"], ADVANCE_STREAM, load]),
+        vocab=build_vocabulary(state["seed"]),
+        loaded_at=loaded_at,
+        next_ids=state["next_ids"],
+        start_ts=state["end_ts"],
+        end_ts=state["end_ts"] + args.advance_days * DAY,
+    )
+    options = ParquetOptions(
+        row_group_size=args.row_group_size,
+        compression=args.compression,
+        partition_events=state["partition_events"],
+        directory_layout=True,
+        data_dir=args.output_dir,
+    )
+
+    print(f"Advancing TechFlow Analytics test data by {args.advance_days} days (load {load})...")
+    print(f"  Window: {datetime.fromtimestamp(ctx.start_ts)} to {datetime.fromtimestamp(ctx.end_ts)}")
+    print()
 
-    stripe_charges = generate_stripe_charges(subscriptions)
-    write_parquet("stripe_charges", stripe_charges)
+    use_directory_layout(args.output_dir)
+    tables = generate_load(ctx, args.advance_days, state["signups_per_day"], args.output_dir)
+    for name, table in tables.items():
+        if name in STATE_TABLES:
+            clear_output(name, args.output_dir)
+            sink = ParquetSink(name, options)
+        else:
+            sink = ParquetSink(name, options, basename=f"load-{load:04d}")
+        sink.write(table)
+        sink.close()
+        suffix = "rows" if name in STATE_TABLES else "new rows"
+        print(f"  {name}/ — {sink.rows} {suffix}")
+
+    write_manifest(args.output_dir)
+    write_state({
+        **state,
+        "end_ts": ctx.end_ts,
+        "loads": load,
+        "next_ids": {table: int(next_id) for table, next_id in ctx.next_ids.items()},
+    }, args.output_dir)
+    print("\nDone! Salesforce tables are unchanged by incremental loads.")
+    print(f"Next: dbt build{dbt_vars(args.output_dir, True)}")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--scale", type=float, default=1.0,
+        help=f"Multiplier on the base population of {BASE_NUM_USERS} users (default: 1.0)",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=DEFAULT_SEED,
+        help=f"Random seed for reproducible output (default: {DEFAULT_SEED})",
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+        help=f"Users per chunk; each chunk is one seeded shard and bounds peak memory (default: {DEFAULT_CHUNK_SIZE})",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="Processes generating shards in parallel; >1 writes one file per shard (default: 1)",
+    )
+    parser.add_argument(
+        "--row-group-size", type=int, default=DEFAULT_ROW_GROUP_SIZE,
+        help=f"Rows per Parquet row group (default: {DEFAULT_ROW_GROUP_SIZE})",
+    )
+    parser.add_argument(
+        "--compression", choices=COMPRESSION_CODECS, default="snappy",
+        help="Parquet compression codec (default: snappy)",
+    )
+    parser.add_argument(
+        "--partition-events", action="store_true",
+        help="Write usage_events and segment_tracks hive-partitioned by event_date",
+    )
+    parser.add_argument(
+        "--advance-days", type=int, metavar="N",
+        help="Instead of regenerating, append N days of new activity to the existing data in --output-dir",
+    )
+    parser.add_argument(
+        "--output-dir", type=Path, default=DATA_DIR, metavar="DIR",
+        help="Directory to write the tables, manifest and generator state to (default: data/)",
+    )
+    parser.add_argument(
+        "--loaded-at", type=datetime.fromisoformat, metavar="TIMESTAMP",
+        help="ISO timestamp to stamp on every row's loaded_at (default: now)",
+    )
+    return parser.parse_args()
 
-    stripe_invoices = generate_stripe_invoices(subscriptions)
-    write_parquet("stripe_invoices", stripe_invoices)
 
-    # segment
-    print("segment:")
-    segment_tracks = generate_segment_tracks(users)
-    write_parquet("segment_tracks", segment_tracks)
+def main() -> None:
+    args = parse_args()
+    loaded_at = args.loaded_at or datetime.now()
+    if args.advance_days:
+        advance(args, loaded_at)
+        return
 
-    segment_identifies = generate_segment_identifies(users)
-    write_parquet("segment_identifies", segment_identifies)
+    num_users = max(1, round(BASE_NUM_USERS * args.scale))
+    vocab = build_vocabulary(args.seed)
+    options = ParquetOptions(
+        row_group_size=args.row_group_size,
+        compression=args.compression,
+        partition_events=args.partition_events,
+        directory_layout=args.workers > 1 or args.partition_events,
+        data_dir=args.output_dir,
+    )
+    shards = plan_shards(num_users, args.chunk_size)
+    args.output_dir.mkdir(parents=True, exist_ok=True)
 
-    # salesforce
-    print("salesforce:")
-    sf_accounts = generate_salesforce_accounts(users)
-    write_parquet("salesforce_accounts", sf_accounts)
+    print("Generating TechFlow Analytics test data...")
+    print(f"  Users: {num_users} (scale {args.scale:g}, {len(shards)} chunks of {args.chunk_size})")
+    print(f"  Date range: {START_DATE.date()} to {END_DATE.date()}")
+    print(f"  Parquet: {options.compression}, {options.row_group_size} rows per row group")
+    print(f"  Workers: {args.workers}")
+    print()
 
-    sf_opportunities = generate_salesforce_opportunities(sf_accounts)
-    write_parquet("salesforce_opportunities", sf_opportunities)
+    for tables in SOURCE_TABLES.values():
+        for name in tables:
+            clear_output(name, args.output_dir)
+
+    tasks = [ShardTask(shard, args.seed, vocab, loaded_at, options) for shard in shards]
+    if args.workers > 1:
+        rows, company_users = generate_parallel(tasks, args.workers)
+    else:
+        rows, company_users = generate_sequential(tasks, options)
+
+    salesforce_ctx = GenerationContext(
+        rng=np.random.default_rng([args.seed, SALESFORCE_STREAM]),
+        vocab=vocab,
+        loaded_at=loaded_at,
+    )
+    for name, table in generate_salesforce(salesforce_ctx, pa.concat_tables(company_users)).items():
+        sink = ParquetSink(name, options)
+        sink.write(table)
+        sink.close()
+        rows[name] = sink.rows
+
+    write_manifest(args.output_dir)
+    write_state({
+        "seed": args.seed,
+        "signups_per_day": num_users * DAY / (END_TS - START_TS),
+        "end_ts": END_TS,
+        "loads": 0,
+        "next_ids": {table: num_users * per_user + 1 for table, per_user in MAX_ROWS_PER_USER.items()},
+        "partition_events": options.partition_events,
+    }, args.output_dir)
+
+    for system, tables in SOURCE_TABLES.items():
+        print(f"{system}:")
+        for name in tables:
+            if not rows.get(name):
+                print(f"  SKIP {name} (no data)")
+            elif options.directory_layout:
+                print(f"  {name}/ — {rows[name]} rows")
+            else:
+                print(f"  {name}.parquet — {rows[name]} rows")
 
-    print("\nDone! Parquet files written to data/")
-    print("Next: dbt deps && dbt seed && dbt build")
+    print(f"\nDone! Parquet files written to {args.output_dir}/")
+    print(f"Next: dbt deps && dbt seed && dbt build{dbt_vars(args.output_dir, options.directory_layout)}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+"""
+Serve named dashboard metrics from the DuckDB marts, with an LRU result cache.
+
+Each metric is a fixed aggregate over one mart (fct_mrr_daily, fct_revenue,
+rpt_marketing_roi, rpt_feature_adoption) with optional filters. Results are
+cached per metric and filter values, so repeated dashboard queries don't
+rescan the mart. Every cache entry records when its model was last built
+according to target/run_results.json; once a dbt invocation rebuilds the
+model, the entry is dropped and the next request queries the new table.
+
+Queries run on a small pool of read-only connections. Connections idle for
+longer than --idle-seconds are closed, because DuckDB only lets dbt open the
+database for writing when no other process has it open.
+
+  query:  print one metric as JSON
+  serve:  HTTP on localhost; GET /metrics lists metrics, and
+          GET /metrics/<name>?product=cloudsync&start_date=2024-06-01
+          returns one as JSON
+
+Usage:
+    python scripts/metrics_service.py query mrr_by_product_day --filter product=cloudsync
+    python scripts/metrics_service.py serve [--port 8050] [--cache-size 256]
+        [--pool-size 4] [--database dev.duckdb] [--schema marts]
+"""
+
+import argparse
+import json
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qsl, urlparse
+
+import duckdb
+
+PROJECT_DIR = Path(__file__).parent.parent
+DEFAULT_DATABASE = PROJECT_DIR / "dev.duckdb"
+DEFAULT_SCHEMA = "marts"
+RUN_RESULTS = PROJECT_DIR / "target" / "run_results.json"
+PROJECT_NAME = "techflow_analytics"
+DEFAULT_CACHE_SIZE = 256
+DEFAULT_POOL_SIZE = 4
+DEFAULT_IDLE_SECONDS = 5.0
+DEFAULT_PORT = 8050
+
+
+@dataclass(frozen=True)
+class Metric:
+    name: str
+    model: str
+    description: str
+    # select statement with {relation} and {where} placeholders
+    sql: str
+    # filter name -> condition with one ? parameter
+    filters: dict[str, str] = field(default_factory=dict)
+
+
+METRICS = {
+    metric.name: metric
+    for metric in [
+        Metric(
+            name="mrr_by_product_day",
+            model="fct_mrr_daily",
+            description="MRR and its daily movements by product and day",
+            sql="""
+                select date_day, product, cumulative_mrr as mrr, new_mrr, expansion_mrr,
+                    contraction_mrr, churned_mrr, net_mrr_change
+                from {relation}
+                {where}
+                order by date_day, product
+            """,
+            filters={
+                "product": "product = ?",
+                "start_date": "date_day >= cast(? as date)",
+                "end_date": "date_day <= cast(? as date)",
+            },
+        ),
+        Metric(
+            name="net_revenue_by_plan",
+            model="fct_revenue",
+            description="Gross, refunded and net revenue by product and plan",
+            sql="""
+                select product, plan_name, count(*) as transactions, sum(revenue_amount) as revenue,
+                    sum(refund_amount) as refunds, sum(net_revenue) as net_revenue
+                from {relation}
+                {where}
+                group by all
+                order by net_revenue desc
+            """,
+            filters={
+                "product": "product = ?",
+                "start_date": "revenue_date >= cast(? as date)",
+                "end_date": "revenue_date < cast(? as date) + interval 1 day",
+            },
+        ),
+        Metric(
+            name="channel_conversion_rate",
+            model="rpt_marketing_roi",
+            description="Users acquired, subscriptions and signup-to-subscription conversion by channel",
+            sql="""
+                select cast(acquisition_channel as varchar) as acquisition_channel,
+                    sum(users_acquired) as users_acquired,
+                    sum(subscriptions_created) as subscriptions_created,
+                    sum(total_mrr_generated) as total_mrr_generated,
+                    max(channel_conversion_rate) as conversion_rate_pct
+                from {relation}
+                {where}
+                group by all
+                order by users_acquired desc
+            """,
+            filters={"acquisition_channel": "cast(acquisition_channel as varchar) = ?"},
+        ),
+        Metric(
+            name="feature_adoption",
+            model="rpt_feature_adoption",
+            description="Adopters and adoption rate per product feature",
+            sql="""
+                select product, feature_name, adopters, product_users, adoption_rate_pct
+                from {relation}
+                {where}
+                order by product, adoption_rate_pct desc
+            """,
+            filters={"product": "product = ?"},
+        ),
+    ]
+}
+
+
+class UnknownMetric(LookupError):
+    pass
+
+
+class InvalidFilter(ValueError):
+    pass
+
+
+class BuildStamps:
+    """When each model was last built, from run_results.json of successive dbt invocations.
+
+    Models missing from the latest run_results.json (e.g. after a `dbt test`
+    or a run with --select) keep the stamp of the run that last built them.
+    """
+
+    def __init__(self, run_results: Path):
+        self.run_results = run_results
+        self._mtime = None
+        self._stamps: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def _refresh(self) -> None:
+        try:
+            mtime = self.run_results.stat().st_mtime_ns
+        except FileNotFoundError:
+            return
+        if mtime == self._mtime:
+            return
+        try:
+            results = json.loads(self.run_results.read_text())
+        except json.JSONDecodeError:
+            return  # dbt is rewriting it; pick it up on the next request
+        self._mtime = mtime
+        for result in results["results"]:
+            if result["status"] != "success" or not result["unique_id"].startswith("model."):
+                continue
+            executed = [step["completed_at"] for step in result["timing"] if step["name"] == "execute"]
+            self._stamps[result["unique_id"]] = executed[-1] if executed else results["metadata"]["generated_at"]
+
+    def get(self, model: str) -> str | None:
+        with self._lock:
+            self._refresh()
+            return self._stamps.get(f"model.{PROJECT_NAME}.{model}")
+
+
+class ConnectionPool:
+    """Up to `size` read-only DuckDB connections, closed again after `idle_seconds` unused."""
+
+    def __init__(self, database: Path, size: int, idle_seconds: float):
+        self.database = database
+        self.size = size
+        self.idle_seconds = idle_seconds
+        self._idle: list[tuple[duckdb.DuckDBPyConnection, float]] = []
+        self._open = 0
+        self._available = threading.Condition()
+        reaper = threading.Thread(target=self._close_idle_connections, daemon=True)
+        reaper.start()
+
+    @contextmanager
+    def connection(self):
+        with self._available:
+            while not self._idle and self._open >= self.size:
+                self._available.wait()
+            if self._idle:
+                connection, _ = self._idle.pop()
+            else:
+                connection = None
+                self._open += 1
+        if connection is None:
+            try:
+                connection = duckdb.connect(str(self.database), read_only=True)
+            except Exception:
+                with self._available:
+                    self._open -= 1
+                    self._available.notify()
+                raise
+        try:
+            yield connection
+        finally:
+            with self._available:
+                self._idle.append((connection, time.monotonic()))
+                self._available.notify()
+
+    def _close_idle_connections(self) -> None:
+        while True:
+            time.sleep(min(self.idle_seconds, 1.0))
+            with self._available:
+                cutoff = time.monotonic() - self.idle_seconds
+                expired = [connection for connection, released in self._idle if released < cutoff]
+                self._idle = [(connection, released) for connection, released in self._idle if released >= cutoff]
+                self._open -= len(expired)
+                self._available.notify(len(expired))
+            for connection in expired:
+                connection.close()
+
+
+class MetricsService:
+    def __init__(
+        self,
+        database: Path = DEFAULT_DATABASE,
+        schema: str = DEFAULT_SCHEMA,
+        run_results: Path = RUN_RESULTS,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        idle_seconds: float = DEFAULT_IDLE_SECONDS,
+    ):
+        self.schema = schema
+        self.cache_size = cache_size
+        self.stamps = BuildStamps(run_results)
+        self.pool = ConnectionPool(database, pool_size, idle_seconds)
+        self._cache: OrderedDict[tuple, tuple[str | None, dict]] = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def query(self, name: str, filters: dict[str, str] | None = None) -> dict:
+        """The metric's rows as dicts, from the cache unless its model was rebuilt since."""
+        metric = METRICS.get(name)
+        if metric is None:
+            raise UnknownMetric(f"Unknown metric '{name}'; available: {', '.join(METRICS)}")
+        filters = filters or {}
+        unknown = sorted(set(filters) - set(metric.filters))
+        if unknown:
+            raise InvalidFilter(
+                f"Metric '{name}' has no filter {', '.join(unknown)}; available: {', '.join(metric.filters)}"
+            )
+
+        key = (name, tuple(sorted(filters.items())))
+        built_at = self.stamps.get(metric.model)
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached and cached[0] == built_at:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return {**cached[1], "cached": True}
+            self.misses += 1
+
+        result = {
+            "metric": name,
+            "model": metric.model,
+            "built_at": built_at,
+            "filters": filters,
+            "rows": self._execute(metric, filters),
+        }
+        with self._cache_lock:
+            self._cache[key] = (built_at, result)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return {**result, "cached": False}
+
+    def cache_stats(self) -> dict:
+        with self._cache_lock:
+            return {"entries": len(self._cache), "hits": self.hits, "misses": self.misses}
+
+    def _execute(self, metric: Metric, filters: dict[str, str]) -> list[dict]:
+        conditions = [metric.filters[name] for name in sorted(filters)]
+        where = f"where {' and '.join(conditions)}" if conditions else ""
+        relation = f'"{self.schema}"."{metric.model}"'
+        sql = metric.sql.format(relation=relation, where=where)
+        with self.pool.connection() as connection:
+            cursor = connection.execute(sql, [filters[name] for name in sorted(filters)])
+            columns = [column[0] for column in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def to_json(value) -> str:
+    return json.dumps(value, default=str, indent=2)
+
+
+def make_handler(service: MetricsService) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        def send_json(self, status: HTTPStatus, body) -> None:
+            payload = to_json(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self) -> None:
+            url = urlparse(self.path)
+            parts = [part for part in url.path.split("/") if part]
+            if parts == ["metrics"]:
+                self.send_json(HTTPStatus.OK, {
+                    "metrics": [
+                        {"name": m.name, "model": m.model, "description": m.description, "filters": list(m.filters)}
+                        for m in METRICS.values()
+                    ],
+                    "cache": service.cache_stats(),
+                })
+            elif len(parts) == 2 and parts[0] == "metrics":
+                try:
+                    self.send_json(HTTPStatus.OK, service.query(parts[1], dict(parse_qsl(url.query))))
+                except UnknownMetric as e:
+                    self.send_json(HTTPStatus.NOT_FOUND, {"error": str(e)})
+                except (InvalidFilter, duckdb.ConversionException) as e:
+                    self.send_json(HTTPStatus.BAD_REQUEST, {"error": str(e)})
+                except (duckdb.IOException, duckdb.CatalogException) as e:
+                    # dbt holds the write lock while it builds, or the mart isn't built yet
+                    self.send_json(HTTPStatus.SERVICE_UNAVAILABLE, {"error": str(e)})
+                except duckdb.Error as e:
+                    # Failed queries are never cached, so a retry queries the mart again
+                    self.send_json(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(e)})
+            else:
+                self.send_json(HTTPStatus.NOT_FOUND, {"error": "GET /metrics or /metrics/<name>"})
+
+    return Handler
+
+
+def parse_filters(values: list[str]) -> dict[str, str]:
+    filters = {}
+    for value in values:
+        name, sep, argument = value.partition("=")
+        if not sep:
+            raise SystemExit(f"--filter expects name=value, got '{value}'")
+        filters[name] = argument
+    return filters
+
+
+def parse_args() -> argparse.Namespace:
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument(
+        "--database", type=Path, default=DEFAULT_DATABASE,
+        help=f"DuckDB database built by dbt (default: {DEFAULT_DATABASE.relative_to(PROJECT_DIR)})",
+    )
+    common.add_argument(
+        "--schema", default=DEFAULT_SCHEMA,
+        help=f"Schema of the marts, e.g. main_marts for the prod target (default: {DEFAULT_SCHEMA})",
+    )
+    common.add_argument(
+        "--run-results", type=Path, default=RUN_RESULTS,
+        help="dbt run results whose model build times invalidate the cache "
+        f"(default: {RUN_RESULTS.relative_to(PROJECT_DIR)})",
+    )
+    common.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_SIZE,
+                        help=f"Cached results kept (default: {DEFAULT_CACHE_SIZE})")
+    common.add_argument("--pool-size", type=int, default=DEFAULT_POOL_SIZE,
+                        help=f"Read-only connections (default: {DEFAULT_POOL_SIZE})")
+    common.add_argument(
+        "--idle-seconds", type=float, default=DEFAULT_IDLE_SECONDS,
+        help=f"Close connections unused for this long, so dbt can write (default: {DEFAULT_IDLE_SECONDS:g})",
+    )
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    query = commands.add_parser("query", parents=[common], help="Print one metric as JSON")
+    query.add_argument("metric", choices=sorted(METRICS))
+    query.add_argument("--filter", action="append", default=[], metavar="NAME=VALUE",
+                       help="Filter, e.g. product=cloudsync or start_date=2024-06-01 (repeatable)")
+    serve = commands.add_parser("serve", parents=[common], help="Serve metrics over HTTP")
+    serve.add_argument("--host", default="127.0.0.1", help="Address to bind (default: 127.0.0.1)")
+    serve.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port (default: {DEFAULT_PORT})")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    service = MetricsService(
+        args.database, args.schema, args.run_results, args.cache_size, args.pool_size, args.idle_seconds,
+    )
+    if args.command == "query":
+        try:
+            print(to_json(service.query(args.metric, parse_filters(args.filter))))
+        except (InvalidFilter, duckdb.Error) as e:
+            raise SystemExit(str(e))
+        return
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(service))
+    print(f"Serving {len(METRICS)} metrics on http://{args.host}:{args.port}/metrics", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
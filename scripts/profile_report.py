@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Rank the operators in DuckDB query profiles written by the profile_model hook.
+
+`dbt build --vars '{profile_models: true}'` writes one JSON profile per table
+and incremental model to target/profile_<model>.json. This script reads them,
+lists the slowest models by query latency, and ranks every operator across
+all profiles by time spent (operator_timing) or by rows produced
+(operator_cardinality), so the joins, aggregates and scans worth optimizing
+stand out.
+
+Usage:
+    python scripts/profile_report.py [--profiles-dir target] [--sort time|rows]
+        [--top 20] [--model fct_events]
+"""
+
+import argparse
+import json
+from dataclasses import dataclass
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).parent.parent
+DEFAULT_PROFILES_DIR = PROJECT_DIR / "target"
+PROFILE_PREFIX = "profile_"
+
+
+@dataclass
+class Operator:
+    model: str
+    name: str
+    seconds: float
+    rows: int
+    rows_scanned: int
+    detail: str
+
+
+def read_profiles(profiles_dir: Path, models: list[str] | None) -> dict[str, dict]:
+    profiles = {}
+    for path in sorted(profiles_dir.glob(f"{PROFILE_PREFIX}*.json")):
+        model = path.stem.removeprefix(PROFILE_PREFIX)
+        if models and model not in models:
+            continue
+        profiles[model] = json.loads(path.read_text())
+    return profiles
+
+
+def describe(extra_info: dict) -> str:
+    """A one-line summary of the operator's extra_info (table, join condition, groups...)."""
+    parts = []
+    for key, value in extra_info.items():
+        if isinstance(value, list):
+            value = ", ".join(str(item) for item in value)
+        parts.append(f"{key}: {value}")
+    return "; ".join(parts).replace("\n", " ")
+
+
+def walk(model: str, node: dict) -> list[Operator]:
+    """Flatten a profile's operator tree, depth first."""
+    operators = []
+    for child in node.get("children", []):
+        operators.append(Operator(
+            model=model,
+            name=child.get("operator_name") or child.get("operator_type", "?"),
+            seconds=child.get("operator_timing", 0.0),
+            rows=child.get("operator_cardinality", 0),
+            rows_scanned=child.get("operator_rows_scanned", 0),
+            detail=describe(child.get("extra_info", {})),
+        ))
+        operators.extend(walk(model, child))
+    return operators
+
+
+def report(profiles: dict[str, dict], sort: str, top: int) -> None:
+    print("Models by latency:")
+    by_latency = sorted(profiles.items(), key=lambda item: item[1].get("latency", 0.0), reverse=True)
+    for model, profile in by_latency[:top]:
+        print(f"  {profile.get('latency', 0.0):8.3f}s  {profile.get('cpu_time', 0.0):8.3f}s cpu  {model}")
+
+    operators = [op for model, profile in profiles.items() for op in walk(model, profile)]
+    key = (lambda op: op.seconds) if sort == "time" else (lambda op: op.rows)
+    print(f"\nOperators by {sort}:")
+    print(f"  {'seconds':>8}  {'rows':>12}  {'scanned':>12}  model / operator")
+    for op in sorted(operators, key=key, reverse=True)[:top]:
+        print(f"  {op.seconds:8.3f}  {op.rows:12,}  {op.rows_scanned:12,}  {op.model} / {op.name}")
+        if op.detail:
+            print(f"  {'':36}{op.detail[:120]}")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--profiles-dir", type=Path, default=DEFAULT_PROFILES_DIR,
+        help="Directory holding profile_<model>.json files (default: target)",
+    )
+    parser.add_argument(
+        "--sort", choices=["time", "rows"], default="time",
+        help="Rank operators by operator_timing or operator_cardinality (default: time)",
+    )
+    parser.add_argument("--top", type=int, default=20, help="Models and operators to list (default: 20)")
+    parser.add_argument("--model", nargs="+", help="Only report these models")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    profiles = read_profiles(args.profiles_dir, args.model)
+    if not profiles:
+        raise SystemExit(
+            f"No {PROFILE_PREFIX}*.json files in {args.profiles_dir}; "
+            "run dbt build --vars '{profile_models: true}' first"
+        )
+    report(profiles, args.sort, args.top)
+
+
+if __name__ == "__main__":
+    main()
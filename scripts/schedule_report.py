@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Compare the DAG critical path of the last dbt invocation with thread utilization.
+
+Reads target/run_results.json for each node's start and end time and thread,
+and target/manifest.json for dependencies. The critical path is the chain of
+dependent nodes with the longest total duration: no number of dbt threads can
+finish the run faster than it. Utilization is busy thread time divided by
+threads x wall time.
+
+  - Critical path close to wall time: the run is bound by a few long models;
+    more dbt threads won't help, but more DuckDB threads per query may
+    (DUCKDB_THREADS).
+  - Low utilization with a short critical path: scheduling overhead or too
+    many threads for the DAG's width; lower DBT_THREADS.
+  - High utilization with a short critical path: the run is throughput-bound;
+    raise DBT_THREADS if DuckDB has cores and memory to spare.
+
+Usage:
+    python scripts/schedule_report.py [--target-dir target] [--threads 4] [--top 15]
+"""
+
+import argparse
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).parent.parent
+DEFAULT_TARGET_DIR = PROJECT_DIR / "target"
+
+
+@dataclass
+class Node:
+    unique_id: str
+    thread: str
+    started_at: datetime
+    completed_at: datetime
+    parents: set[str] = field(default_factory=set)
+
+    @property
+    def seconds(self) -> float:
+        return (self.completed_at - self.started_at).total_seconds()
+
+
+def parse_time(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def read_nodes(target_dir: Path) -> tuple[dict[str, Node], str]:
+    """Executed nodes with their run-time parents, and the dbt command that ran them."""
+    run_results = json.loads((target_dir / "run_results.json").read_text())
+    manifest = json.loads((target_dir / "manifest.json").read_text())
+    graph = {**manifest["nodes"], **manifest.get("sources", {}), **manifest.get("unit_tests", {})}
+
+    nodes = {}
+    for result in run_results["results"]:
+        timings = [t for t in result["timing"] if t.get("started_at")]
+        if not timings:
+            continue
+        nodes[result["unique_id"]] = Node(
+            unique_id=result["unique_id"],
+            thread=result["thread_id"],
+            started_at=min(parse_time(t["started_at"]) for t in timings),
+            completed_at=max(parse_time(t["completed_at"]) for t in timings),
+        )
+
+    def depends_on(unique_id: str) -> list[str]:
+        return graph.get(unique_id, {}).get("depends_on", {}).get("nodes", [])
+
+    def executed_parents(unique_id: str, seen: set[str]) -> set[str]:
+        # Ephemeral models and sources don't run; look through them to what did
+        parents = set()
+        for parent in depends_on(unique_id):
+            if parent in seen:
+                continue
+            seen.add(parent)
+            parents |= {parent} if parent in nodes else executed_parents(parent, seen)
+        return parents
+
+    for node in nodes.values():
+        node.parents = executed_parents(node.unique_id, set())
+
+    # Unit tests run before the model they test, as soon as its parents are built
+    built_from = {unique_id: set(node.parents) for unique_id, node in nodes.items()}
+    for node in nodes.values():
+        if node.unique_id.startswith("unit_test."):
+            for model in built_from[node.unique_id]:
+                node.parents = set(built_from[model])
+                nodes[model].parents.add(node.unique_id)
+
+    command = run_results["args"].get("which", "")
+    if command == "build":
+        # dbt build runs a node's children only after the node's data tests pass
+        tests: dict[str, set[str]] = {}
+        for node in nodes.values():
+            if node.unique_id.startswith("test."):
+                for parent in depends_on(node.unique_id):
+                    if parent in nodes:
+                        tests.setdefault(parent, set()).add(node.unique_id)
+        for node in nodes.values():
+            if not node.unique_id.startswith(("test.", "unit_test.")):
+                node.parents |= {
+                    test for parent in depends_on(node.unique_id) for test in tests.get(parent, ())
+                }
+    return nodes, command
+
+
+def critical_path(nodes: dict[str, Node]) -> list[Node]:
+    """The chain of dependent nodes with the longest total duration."""
+    longest: dict[str, tuple[float, str | None]] = {}
+
+    def visit(unique_id: str) -> float:
+        if unique_id not in longest:
+            best_parent, best = None, 0.0
+            for parent in nodes[unique_id].parents:
+                length = visit(parent)
+                if length > best:
+                    best_parent, best = parent, length
+            longest[unique_id] = (best + nodes[unique_id].seconds, best_parent)
+        return longest[unique_id][0]
+
+    for unique_id in nodes:
+        visit(unique_id)
+    unique_id = max(longest, key=lambda key: longest[key][0])
+    path = []
+    while unique_id:
+        path.append(nodes[unique_id])
+        unique_id = longest[unique_id][1]
+    return path[::-1]
+
+
+def report(nodes: dict[str, Node], command: str, threads: int, top: int) -> None:
+    start = min(node.started_at for node in nodes.values())
+    wall = (max(node.completed_at for node in nodes.values()) - start).total_seconds()
+    busy: dict[str, float] = {}
+    for node in nodes.values():
+        busy[node.thread] = busy.get(node.thread, 0.0) + node.seconds
+    work = sum(busy.values())
+    path = critical_path(nodes)
+    path_seconds = sum(node.seconds for node in path)
+
+    print(f"dbt {command or 'run'}: {len(nodes)} nodes on {threads} threads")
+    print(f"  wall time          {wall:8.2f}s")
+    print(f"  critical path      {path_seconds:8.2f}s  ({path_seconds / wall:.0%} of wall time)")
+    print(f"  total node time    {work:8.2f}s")
+    print(f"  utilization        {work / (threads * wall):8.0%}")
+    print(f"  lower bound        {max(path_seconds, work / threads):8.2f}s  (max of critical path, work / threads)")
+
+    print("\nThreads:")
+    for thread, seconds in sorted(busy.items()):
+        print(f"  {seconds:8.2f}s  {seconds / wall:4.0%}  {thread}")
+
+    print("\nCritical path:")
+    for node in path:
+        offset = (node.started_at - start).total_seconds()
+        print(f"  +{offset:7.2f}s  {node.seconds:7.2f}s  {node.unique_id}")
+
+    print("\nSlowest nodes:")
+    for node in sorted(nodes.values(), key=lambda n: n.seconds, reverse=True)[:top]:
+        print(f"  {node.seconds:8.2f}s  {node.unique_id}")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--target-dir", type=Path, default=DEFAULT_TARGET_DIR,
+        help="Directory holding run_results.json and manifest.json (default: target)",
+    )
+    parser.add_argument(
+        "--threads", type=int,
+        help="dbt threads the run used (default: the number of threads seen in run_results.json)",
+    )
+    parser.add_argument("--top", type=int, default=15, help="Slowest nodes to list (default: 15)")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    nodes, command = read_nodes(args.target_dir)
+    if not nodes:
+        raise SystemExit(f"No executed nodes in {args.target_dir / 'run_results.json'}")
+    threads = args.threads or len({node.thread for node in nodes.values()})
+    report(nodes, command, threads, args.top)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Slim CI on one machine, offline: build only what a branch changed, deferring
+everything else to a cached build of the base branch.
+
+The base ref is checked out into a temporary git worktree, pointed at the
+current data/ directory and dbt_packages/, and built once into ci.duckdb (the
+`ci` target in profiles.yml). That database and its manifest.json are cached
+under .ci-cache/<key>, where the key hashes the base ref's models, macros,
+seeds, snapshots and dbt_project.yml, the bytes of every data file, and the
+installed dbt and packages. Later runs with the same key skip the base build,
+so data/ must be generated with a pinned --loaded-at for the key to repeat.
+
+Each run then restores the cached database as ci.duckdb and runs
+`dbt build --select state:modified+ --defer --state .ci-cache/<key>`, so a
+change to one mart builds that mart and its children on top of the base
+build. Arguments after `--` are passed to dbt build.
+
+Usage:
+    python scripts/slim_ci.py [--base main] [--keep 3] [--rebuild] [-- --fail-fast]
+"""
+
+import argparse
+import hashlib
+import json
+import shutil
+import subprocess
+import tempfile
+from datetime import datetime, timezone
+from importlib.metadata import version
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).parent.parent
+DATA_DIR = PROJECT_DIR / "data"
+PACKAGES_DIR = PROJECT_DIR / "dbt_packages"
+CACHE_DIR = PROJECT_DIR / ".ci-cache"
+CI_TARGET = "ci"
+CI_DATABASE = "ci.duckdb"
+# Everything in the base ref that changes what a build produces
+KEY_PATHS = ["dbt_project.yml", "macros", "models", "seeds", "snapshots"]
+DEFAULT_KEEP = 3
+
+
+def run(command: list[str], cwd: Path = PROJECT_DIR) -> None:
+    print(f"$ {' '.join(command)}", flush=True)
+    subprocess.run(command, cwd=cwd, check=True)
+
+
+def git(*args: str) -> str:
+    return subprocess.run(["git", *args], cwd=PROJECT_DIR, capture_output=True, text=True, check=True).stdout
+
+
+def source_layout() -> str:
+    """The source_layout var matching what the generator wrote."""
+    return "directory" if (DATA_DIR / "users").is_dir() else "file"
+
+
+def dbt(*args: str) -> list[str]:
+    command = ["dbt", *args, "--target", CI_TARGET, "--vars", json.dumps({"source_layout": source_layout()})]
+    if (PROJECT_DIR / "profiles.yml").exists():
+        command += ["--profiles-dir", str(PROJECT_DIR.resolve())]
+    return command
+
+
+def cache_key(base: str) -> str:
+    """Hash of the base ref's project files, the data files, and the installed dbt and packages."""
+    digest = hashlib.sha256()
+    digest.update(git("ls-tree", "-r", base, "--", *KEY_PATHS).encode())
+    for path in sorted(p for p in DATA_DIR.rglob("*") if p.is_file()):
+        digest.update(str(path.relative_to(DATA_DIR)).encode())
+        with path.open("rb") as data:
+            digest.update(hashlib.file_digest(data, "sha256").digest())
+    for package in ("dbt-core", "dbt-duckdb"):
+        digest.update(f"{package}=={version(package)}".encode())
+    for lock in ("packages.yml", "package-lock.yml"):
+        if (PROJECT_DIR / lock).exists():
+            digest.update((PROJECT_DIR / lock).read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def build_snapshot(base: str, snapshot_dir: Path) -> None:
+    """Build the base ref in a temporary worktree and cache its database and manifest."""
+    if not PACKAGES_DIR.is_dir():
+        raise SystemExit("dbt_packages/ not found; run `dbt deps` once so builds can run offline")
+
+    with tempfile.TemporaryDirectory(prefix="slim-ci-") as tmp:
+        worktree = Path(tmp) / "base"
+        run(["git", "worktree", "add", "--detach", str(worktree), base])
+        try:
+            # Same data and packages as the branch under test, whatever the base committed
+            shutil.rmtree(worktree / "data", ignore_errors=True)
+            (worktree / "data").symlink_to(DATA_DIR.resolve(), target_is_directory=True)
+            shutil.copytree(PACKAGES_DIR, worktree / "dbt_packages", symlinks=True)
+            for lock in ("packages.yml", "package-lock.yml"):
+                if (PROJECT_DIR / lock).exists():
+                    shutil.copy2(PROJECT_DIR / lock, worktree / lock)
+
+            run(dbt("seed"), cwd=worktree)
+            run(dbt("build"), cwd=worktree)
+
+            partial = snapshot_dir.with_suffix(".partial")
+            shutil.rmtree(partial, ignore_errors=True)
+            partial.mkdir(parents=True)
+            shutil.copy2(worktree / CI_DATABASE, partial / CI_DATABASE)
+            shutil.copy2(worktree / "target" / "manifest.json", partial / "manifest.json")
+            (partial / "snapshot.json").write_text(json.dumps({
+                "base": base,
+                "base_sha": git("rev-parse", base).strip(),
+                "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            }, indent=2) + "\n")
+            partial.rename(snapshot_dir)
+        finally:
+            run(["git", "worktree", "remove", "--force", str(worktree)])
+
+
+def restore_snapshot(snapshot_dir: Path) -> None:
+    """Replace ci.duckdb with a copy of the cached base build."""
+    database = PROJECT_DIR / CI_DATABASE
+    database.with_name(CI_DATABASE + ".wal").unlink(missing_ok=True)
+    shutil.copy2(snapshot_dir / CI_DATABASE, database)
+    print(f"Restored {snapshot_dir / CI_DATABASE} to {database}")
+
+
+def prune(keep: int, current: Path) -> None:
+    """Delete all but the most recently used snapshots."""
+    snapshots = sorted(
+        (path for path in CACHE_DIR.iterdir() if path.is_dir() and path != current),
+        key=lambda path: path.stat().st_mtime, reverse=True,
+    )
+    for stale in snapshots[max(keep - 1, 0):]:
+        shutil.rmtree(stale)
+        print(f"Pruned {stale}")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base", default="main", help="Git ref to defer to (default: main)")
+    parser.add_argument(
+        "--keep", type=int, default=DEFAULT_KEEP,
+        help=f"Snapshots to keep in {CACHE_DIR.name}/ (default: {DEFAULT_KEEP})",
+    )
+    parser.add_argument("--rebuild", action="store_true", help="Rebuild the base snapshot even if cached")
+    parser.add_argument("dbt_args", nargs=argparse.REMAINDER, help="Extra arguments for dbt build, after --")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    key = cache_key(args.base)
+    snapshot_dir = CACHE_DIR / key
+
+    if args.rebuild and snapshot_dir.exists():
+        shutil.rmtree(snapshot_dir)
+    if snapshot_dir.exists():
+        print(f"Using cached build of {args.base} ({snapshot_dir})")
+    else:
+        print(f"No cached build of {args.base} for key {key}; building it")
+        build_snapshot(args.base, snapshot_dir)
+    snapshot_dir.touch()
+    prune(args.keep, snapshot_dir)
+
+    restore_snapshot(snapshot_dir)
+    extra = [arg for arg in args.dbt_args if arg != "--"]
+    run(dbt("build", "--select", "state:modified+", "--defer", "--state", str(snapshot_dir), *extra))
+
+
+if __name__ == "__main__":
+    main()
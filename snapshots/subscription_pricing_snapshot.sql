@@ -4,7 +4,7 @@
     config(
         target_schema='snapshots',
         unique_key='subscription_id',
-        strategy='timestamp',
+        strategy='hashed_timestamp',
         updated_at='updated_at',
     )
 }}
@@ -18,7 +18,24 @@ select
     subscription_amount,
     monthly_amount,
     subscription_status,
-    cast(updated_at as timestamp) as updated_at
+    created_at,
+    canceled_at,
+    ended_at,
+    cast(updated_at as timestamp) as updated_at,
+    loaded_at,
+    {{ dbt_utils.generate_surrogate_key([
+        'user_id',
+        'product',
+        'plan_name',
+        'billing_period',
+        'subscription_amount',
+        'monthly_amount',
+        'subscription_status',
+        'created_at',
+        'canceled_at',
+        'ended_at',
+    ]) }} as row_hash
 from {{ ref('stg_app_db__subscriptions') }}
+where {{ snapshot_high_water_mark('loaded_at') }}
 
 {% endsnapshot %}
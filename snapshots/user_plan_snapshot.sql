@@ -4,7 +4,7 @@
     config(
         target_schema='snapshots',
         unique_key='user_id',
-        strategy='timestamp',
+        strategy='hashed_timestamp',
         updated_at='updated_at',
     )
 }}
@@ -14,7 +14,10 @@ select
     account_status,
     account_tier,
     is_active_user,
-    cast(updated_at as timestamp) as updated_at
+    cast(updated_at as timestamp) as updated_at,
+    loaded_at,
+    {{ dbt_utils.generate_surrogate_key(['account_status', 'account_tier', 'is_active_user']) }} as row_hash
 from {{ ref('stg_app_db__users') }}
+where {{ snapshot_high_water_mark('loaded_at') }}
 
 {% endsnapshot %}
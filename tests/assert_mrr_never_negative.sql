@@ -4,5 +4,5 @@ select
     date_day,
     product,
     cumulative_mrr
-from {{ ref('fct_mrr_daily') }}
+from {{ scoped_relation(ref('fct_mrr_daily')) }}
 where cumulative_mrr < 0
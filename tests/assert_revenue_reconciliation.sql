@@ -3,6 +3,6 @@ select
     revenue_id,
     revenue_source,
     net_revenue
-from {{ ref('fct_revenue') }}
+from {{ scoped_relation(ref('fct_revenue')) }}
 where net_revenue < 0
     and status = 'succeeded'
@@ -0,0 +1,33 @@
+-- Revenue rows must come from charges that still succeeded and invoices that are
+-- still paid as of their latest load: a refund or failure loaded after the row was
+-- written has to remove it (fct_revenue's pre-hook deletes those within
+-- revenue_lookback_days). Checks the whole table, since the rows it catches were
+-- written by earlier runs
+with
+
+latest_charges as (
+    select
+        charge_id as revenue_id,
+        charge_status = 'succeeded' as counts_as_revenue
+    from {{ ref('stg_stripe__charges') }}
+    qualify row_number() over (partition by charge_id order by loaded_at desc) = 1
+),
+
+latest_invoices as (
+    select
+        invoice_id as revenue_id,
+        invoice_status = 'paid' as counts_as_revenue
+    from {{ ref('stg_stripe__invoices') }}
+    qualify row_number() over (partition by invoice_id order by loaded_at desc) = 1
+)
+
+select
+    r.revenue_id,
+    r.revenue_source,
+    r.status
+from {{ ref('fct_revenue') }} as r
+left join latest_charges as c
+    on r.revenue_source = 'charge' and r.revenue_id = c.revenue_id
+left join latest_invoices as i
+    on r.revenue_source = 'invoice' and r.revenue_id = i.revenue_id
+where not coalesce(c.counts_as_revenue, i.counts_as_revenue, true)
@@ -3,6 +3,6 @@ select
     subscription_id,
     subscription_status,
     ended_at
-from {{ ref('stg_app_db__subscriptions') }}
+from {{ scoped_relation(ref('stg_app_db__subscriptions')) }}
 where subscription_status = 'active'
     and ended_at is not null
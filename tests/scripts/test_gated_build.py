@@ -0,0 +1,73 @@
+"""
+Tests for the freshness gate in scripts/gated_build.py.
+
+Run with: uv run python -m unittest discover -s tests/scripts
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parents[2] / "scripts"))
+
+import gated_build  # noqa: E402
+
+USERS = "source.techflow_analytics.app_db.users"
+ACCOUNTS = "source.techflow_analytics.salesforce.accounts"
+
+DBT_MANIFEST = {
+    "sources": {
+        USERS: {
+            "relation_name": "read_parquet('data/users/**/*.parquet', hive_partitioning = true, union_by_name = true)",
+        },
+        ACCOUNTS: {"relation_name": "'data/salesforce_accounts.parquet'"},
+    },
+}
+
+
+def freshness(**statuses: str) -> dict:
+    ids = {"users": USERS, "accounts": ACCOUNTS}
+    return {"results": [{"unique_id": ids[name], "status": status} for name, status in statuses.items()]}
+
+
+class SourceTablesTest(unittest.TestCase):
+    def test_reads_table_names_from_either_layout(self):
+        self.assertEqual(
+            gated_build.source_tables(DBT_MANIFEST),
+            {USERS: "users", ACCOUNTS: "salesforce_accounts"},
+        )
+
+
+class FailedFreshnessTest(unittest.TestCase):
+    tables = {USERS: "users", ACCOUNTS: "salesforce_accounts"}
+
+    def test_stale_source_nothing_reloaded_does_not_block(self):
+        blocking, unchanged = gated_build.failed_freshness(
+            freshness(users="pass", accounts="error"), self.tables, advanced=["users"],
+        )
+        self.assertEqual(blocking, [])
+        self.assertEqual(unchanged, [ACCOUNTS])
+
+    def test_stale_source_that_was_reloaded_blocks(self):
+        blocking, unchanged = gated_build.failed_freshness(
+            freshness(users="error", accounts="pass"), self.tables, advanced=["users"],
+        )
+        self.assertEqual(blocking, [USERS])
+        self.assertEqual(unchanged, [])
+
+    def test_runtime_error_blocks_even_when_unchanged(self):
+        blocking, unchanged = gated_build.failed_freshness(
+            freshness(users="pass", accounts="runtime error"), self.tables, advanced=[],
+        )
+        self.assertEqual(blocking, [ACCOUNTS])
+        self.assertEqual(unchanged, [])
+
+    def test_warnings_pass(self):
+        self.assertEqual(
+            gated_build.failed_freshness(freshness(users="warn", accounts="warn"), self.tables, advanced=[]),
+            ([], []),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()